@@ -0,0 +1,49 @@
+import argparse
+from soylemma import Lemmatizer
+from soylemma.pruning import evaluate
+from soylemma.pruning import fit_pruned_jamo_rules
+from soylemma.pruning import load_dictionary_counts
+from soylemma.pruning import load_word_counts
+from soylemma.pruning import profile
+from soylemma.pruning import prune
+from soylemma.pruning import pruned_lemmatizer
+from soylemma.pruning import save_dictionary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', type=str, required=True,
+        help='Representative corpus path. Words are separated by white space')
+    parser.add_argument('--dictionary_name', type=str, default='default', help='Dictionary name to be pruned')
+    parser.add_argument('--output_name', type=str, default='pruned', help='Pruned dictionary name')
+    parser.add_argument('--max_loss', type=float, default=0.001,
+        help='Accuracy-loss budget. Fraction of corpus words allowed to change their analysis')
+    parser.add_argument('--heldout_corpus', type=str, default=None,
+        help='Corpus not used for profiling. If given, accuracy loss on it is also reported')
+    parser.add_argument('--jamo_rules', dest='jamo_rules', action='store_true',
+        help='Also save rules generalized at jamo level, which are exact on words of the corpus')
+
+    args = parser.parse_args()
+    dictionary_path = './soylemma/dictionary/{}/'.format(args.output_name)
+
+    word_counts = load_word_counts(args.corpus)
+    base = Lemmatizer(dictionary_name=args.dictionary_name)
+    prof = profile(base, word_counts)
+    counts = load_dictionary_counts(args.dictionary_name)
+    verbs, adjectives, eomis, rules = prune(base, prof, args.max_loss, counts)
+    jamo_rules = None
+    if args.jamo_rules:
+        jamo_rules = fit_pruned_jamo_rules(verbs, adjectives, eomis, rules, word_counts)
+    save_dictionary(dictionary_path, verbs, adjectives, eomis, rules, jamo_rules)
+
+    pruned = pruned_lemmatizer(verbs, adjectives, eomis, rules)
+    report = evaluate(base, pruned, word_counts)
+    print('Accuracy loss: {:.5f} % (budget {:.5f} %)'.format(100 * report['accuracy_loss'], 100 * args.max_loss))
+    if args.heldout_corpus is not None:
+        heldout = evaluate(base, pruned, load_word_counts(args.heldout_corpus))
+        print('Held-out accuracy loss: {:.5f} %'.format(100 * heldout['accuracy_loss']))
+    for key in ['n_verbs', 'n_adjectives', 'n_eomis', 'n_rules', 'candidates_per_word', 'memory_bytes', 'words_per_sec']:
+        print('{}: {:.1f} -> {:.1f}'.format(key, report['base'][key], report['pruned'][key]))
+
+if __name__ == '__main__':
+    main()
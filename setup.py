@@ -22,6 +22,11 @@ setuptools.setup(
             'dictionary/demo/*'
         ]
     },
+    extras_require={
+        'numpy': ['numpy'],
+        'pandas': ['numpy', 'pandas'],
+        'arrow': ['pyarrow'],
+    },
     keywords = [
         'korean-nlp',
         'nlp',
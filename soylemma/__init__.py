@@ -2,15 +2,29 @@ __author__ = 'lovit'
 __name__ = 'soylemma: Korean trained lemmatizer'
 __version__ = '0.2.0'
 
+from .bulk import BulkAnalysis
+from .bulk import LayeredVocabulary
+from .bulk import Vocabulary
+from .cache import AnalysisCache
+from .compact import CompactMorphemeSet
+from .layered import LayeredMorphemeSet
+from .layered import LayeredRules
 from .lemmatizer import Lemmatizer
 from .lemmatizer import analyze_morphology
+from .lemmatizer import analyze_morphology_bounded
 from .lemmatizer import get_lemma_candidates
+from .memory import measure_loading
+from .jamo import JamoRules
+from .jamo import fit_jamo_rules
+from .jamo import generalize_rules
 from .hangle import compose
 from .hangle import decompose
 from .hangle import is_hangle
 from .trainer import extract_rule
 from .trainer import extract_rules
+from .trainer import iter_count_table
 from .trainer import load_word_morpheme_table
+from .trainer import train_model_bounded_memory
 from .trainer import train_model_using_sejong_corpus_cleaner
 from .utils import installpath
 
@@ -0,0 +1,234 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from .lemmatizer import to_lemmas
+
+
+class AsyncLemmatizer:
+    """
+    asyncio facade of Lemmatizer
+
+    Arguments
+    ---------
+    lemmatizer : Lemmatizer
+        Lemmatizer which performs analysis
+    executor : str or concurrent.futures.Executor
+        'thread', 'process', or an Executor instance.
+        With 'process', the lemmatizer is sent to each worker process once.
+        With an Executor instance, the lemmatizer is sent with every batch.
+    max_workers : int or None
+        Number of workers of 'thread' or 'process' executor
+    batch_size : int
+        Number of words analyzed by one executor call
+    max_pending : int
+        Maximum number of batches submitted but not yet consumed.
+        `analyze_stream` stops reading input while this many batches are pending.
+
+    Words are analyzed in the executor, so the event loop is never blocked by analysis.
+
+    Usage
+    -----
+        >>> from soylemma import Lemmatizer
+        >>> from soylemma.aio import AsyncLemmatizer
+
+        >>> async def main():
+        >>>     async with AsyncLemmatizer(Lemmatizer(), executor='process') as lemmatizer:
+        >>>         print(await lemmatizer.lemmatize_many(['차가우니까', '파랬다']))
+        >>>         async for text, morphs in lemmatizer.analyze_stream(texts):
+        >>>             ...
+
+        >>> asyncio.run(main())
+        $ [[('차갑다', 'Adjective')], [('파랗다', 'Adjective')]]
+    """
+
+    def __init__(self, lemmatizer, executor='thread', max_workers=None,
+        batch_size=256, max_pending=4):
+
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError('batch_size and max_pending must be positive')
+
+        self.lemmatizer = lemmatizer
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._owns_executor = not isinstance(executor, Executor)
+        self._in_worker = False
+
+        if executor == 'thread':
+            executor = ThreadPoolExecutor(max_workers)
+        elif executor == 'process':
+            executor = ProcessPoolExecutor(max_workers,
+                initializer=_initialize_worker, initargs=(lemmatizer,))
+            self._in_worker = True
+        elif not isinstance(executor, Executor):
+            raise ValueError("You put wrong executor '{}'. Acceptable only ['thread', 'process'] or Executor".format(executor))
+        self.executor = executor
+
+    def _submit(self, words):
+        loop = asyncio.get_running_loop()
+        if self._in_worker:
+            return loop.run_in_executor(self.executor, _analyze_in_worker, words)
+        return loop.run_in_executor(self.executor, _analyze, self.lemmatizer, words)
+
+    async def analyze_many(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to perform morphological analysis
+
+        Returns
+        -------
+        morphemes : list of list of tuple
+            Analysis results aligned with input words
+
+        Words are split into batches and the batches are analyzed concurrently,
+        at most `max_pending` batches at a time. If a batch raises an exception,
+        the other pending batches are cancelled or awaited before it is raised.
+        """
+
+        words = list(words)
+        results = []
+        pending = deque()
+        try:
+            for b in range(0, len(words), self.batch_size):
+                if len(pending) >= self.max_pending:
+                    results += await pending.popleft()
+                pending.append(self._submit(words[b: b + self.batch_size]))
+            while pending:
+                results += await pending.popleft()
+        except BaseException:
+            await _cancel(pending)
+            raise
+        return results
+
+    async def lemmatize_many(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to recover canonical form (lemma)
+
+        Returns
+        -------
+        lemmas : list of list of tuple
+            Lemmas aligned with input words
+        """
+
+        return [to_lemmas(morphs) for morphs in await self.analyze_many(words)]
+
+    async def analyze_stream(self, texts):
+        """
+        Arguments
+        ---------
+        texts : async iterable or iterable of str
+            Texts. Each text is split into words by white space.
+
+        Yields
+        ------
+        text, morphemes : str, list of list of tuple
+            Analysis results aligned with `text.split()`, in input order
+
+        Words of several texts are gathered into batches of `batch_size`, and a text
+        longer than `batch_size` words is split over several batches.
+        Results are yielded as soon as the batches of the text complete,
+        and input is not read while `max_pending` batches are pending (backpressure).
+        """
+
+        # pending : deque of (list of (text, n_words, is_last_part), future)
+        pending = deque()
+        batch_texts, batch_words = [], []
+        # analyses of the text whose parts are in several batches
+        text_morphs = []
+
+        async def consume():
+            batch_texts_, future = pending.popleft()
+            morphs = await future
+            b = 0
+            for text, n_words, is_last_part in batch_texts_:
+                text_morphs.extend(morphs[b: b + n_words])
+                b += n_words
+                if is_last_part:
+                    morphs_ = text_morphs[:]
+                    text_morphs.clear()
+                    yield text, morphs_
+
+        try:
+            async for text in _aiter(texts):
+                words = text.split()
+                b = 0
+                while True:
+                    n_words = min(len(words) - b, self.batch_size - len(batch_words))
+                    batch_words += words[b: b + n_words]
+                    b += n_words
+                    batch_texts.append((text, n_words, b == len(words)))
+                    if len(batch_words) >= self.batch_size:
+                        pending.append((batch_texts, self._submit(batch_words)))
+                        batch_texts, batch_words = [], []
+                        while len(pending) >= self.max_pending or (pending and pending[0][1].done()):
+                            async for item in consume():
+                                yield item
+                    if b == len(words):
+                        break
+
+            if batch_texts:
+                pending.append((batch_texts, self._submit(batch_words)))
+            while pending:
+                async for item in consume():
+                    yield item
+        finally:
+            await _cancel([future for _, future in pending])
+
+    def close(self):
+        """
+        Shut down the executor created by this instance, waiting for running batches.
+        In a coroutine, use `aclose` not to block the event loop.
+        """
+
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    async def aclose(self):
+        """
+        Same with `close`, but the executor is shut down in the default executor of the loop,
+        so the event loop is not blocked while waiting for running batches.
+        """
+
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+async def _cancel(futures):
+    # cancels batches not started yet, and waits for running ones
+    # so that no exception is left unretrieved
+    for future in futures:
+        future.cancel()
+    await asyncio.gather(*futures, return_exceptions=True)
+
+async def _aiter(texts):
+    if hasattr(texts, '__aiter__'):
+        async for text in texts:
+            yield text
+    else:
+        for text in texts:
+            yield text
+            # give other tasks a chance to run between items of a sync iterable
+            await asyncio.sleep(0)
+
+def _analyze(lemmatizer, words):
+    return lemmatizer.analyze_many(words)
+
+_worker_lemmatizer = None
+
+def _initialize_worker(lemmatizer):
+    global _worker_lemmatizer
+    _worker_lemmatizer = lemmatizer
+
+def _analyze_in_worker(words):
+    return _worker_lemmatizer.analyze_many(words)
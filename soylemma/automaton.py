@@ -0,0 +1,151 @@
+from array import array
+from collections import deque
+
+
+class RuleAutomaton:
+    """
+    Aho-Corasick automaton over surfaces of lemmatization rules
+
+    Arguments
+    ---------
+    surfaces : collection of str
+        Surfacial forms, the keys of lemma_rules
+
+    It finds every (position, surface) match of a word in one left-to-right scan,
+    without slicing substrings at each position. Surfaces of any length are matched.
+
+    A transition (state, character) is stored as one int key `state << 21 | ord(character)`
+    in a single dict, and failure links are stored in an int array.
+
+    Usage
+    -----
+        >>> automaton = RuleAutomaton(['했', '랬', '가우', '가우니'])
+        >>> list(automaton.iter_matches('차가우니까'))
+        $ [(1, '가우'), (1, '가우니')]
+    """
+
+    def __init__(self, surfaces):
+        self._build(surfaces)
+
+    def _build(self, surfaces):
+        transitions = {}
+        depth = [0]
+        # {state:surface} of states which are the end of a surface
+        terminal = {}
+        for surface in surfaces:
+            state = 0
+            for c in surface:
+                key = (state << 21) | ord(c)
+                next_state = transitions.get(key)
+                if next_state is None:
+                    next_state = len(depth)
+                    depth.append(depth[state] + 1)
+                    transitions[key] = next_state
+                state = next_state
+            if surface:
+                terminal[state] = surface
+
+        children = {}
+        for key, next_state in transitions.items():
+            children.setdefault(key >> 21, []).append((key & 0x1FFFFF, next_state))
+
+        # breadth first search to find failure links and merged outputs
+        fail = array('i', [0]) * len(depth)
+        outputs = {}
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for o, child in children.get(state, ()):
+                queue.append(child)
+                if state > 0:
+                    f = fail[state]
+                    while True:
+                        next_state = transitions.get((f << 21) | o)
+                        if next_state is not None:
+                            fail[child] = next_state
+                            break
+                        if f == 0:
+                            break
+                        f = fail[f]
+                output = outputs.get(fail[child], ())
+                if child in terminal:
+                    output = ((terminal[child], depth[child]),) + output
+                if output:
+                    outputs[child] = output
+
+        self._transitions = transitions
+        self._fail = fail
+        self._outputs = outputs
+        self.n_surfaces = len(terminal)
+        self.max_length = max((depth[state] for state in terminal), default=0)
+
+    def iter_matches(self, word, begin=0):
+        """
+        Arguments
+        ---------
+        word : str
+            A word to scan
+        begin : int
+            The scan starts at word[begin], so only surfaces starting at or after it are found
+
+        Yields
+        ------
+        begin, surface : int, str
+            Surface which starts at word[begin]. Matches are yielded in order of their end.
+        """
+
+        transitions, fail, outputs = self._transitions, self._fail, self._outputs
+        state = 0
+        for end in range(begin, len(word)):
+            c = word[end]
+            o = ord(c)
+            while True:
+                next_state = transitions.get((state << 21) | o)
+                if next_state is not None:
+                    state = next_state
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            output = outputs.get(state)
+            if output:
+                for surface, length in output:
+                    yield end - length + 1, surface
+
+    def __len__(self):
+        return self.n_surfaces
+
+    def __repr__(self):
+        return 'RuleAutomaton({} surfaces, {} states)'.format(self.n_surfaces, len(self._fail))
+
+
+class LayeredAutomaton:
+    """
+    Automaton composed of a shared read-only base and a small private overlay
+
+    Arguments
+    ---------
+    base : RuleAutomaton or LayeredAutomaton
+        Shared automaton. It is never rebuilt through this object.
+    surfaces : collection of str
+        Private surfaces which are not in the base
+
+    It is the automaton of `LayeredRules`. Adding private rules rebuilds only
+    the overlay automaton over the private surfaces.
+    """
+
+    def __init__(self, base, surfaces=()):
+        self.base = base
+        self.overlay = RuleAutomaton(surfaces)
+        self.n_surfaces = base.n_surfaces + self.overlay.n_surfaces
+        self.max_length = max(base.max_length, self.overlay.max_length)
+
+    def iter_matches(self, word, begin=0):
+        yield from self.base.iter_matches(word, begin)
+        yield from self.overlay.iter_matches(word, begin)
+
+    def __len__(self):
+        return self.n_surfaces
+
+    def __repr__(self):
+        return 'LayeredAutomaton(base={}, overlay={})'.format(len(self.base), len(self.overlay))
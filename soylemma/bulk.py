@@ -0,0 +1,214 @@
+from array import array
+from .utils import VERB, ADJECTIVE, EOMI
+
+
+class Vocabulary:
+    """
+    Mapper between morphemes (or tags) and integer ids
+
+    Arguments
+    ---------
+    items : collection of str
+        Initial items. Their ids are assigned in the given order.
+    """
+
+    def __init__(self, items=()):
+        self.idx_to_item = []
+        self.item_to_idx = {}
+        for item in items:
+            self.intern(item)
+
+    def get(self, item):
+        return self.item_to_idx.get(item)
+
+    def intern(self, item):
+        idx = self.item_to_idx.get(item)
+        if idx is None:
+            idx = len(self.idx_to_item)
+            self.item_to_idx[item] = idx
+            self.idx_to_item.append(item)
+        return idx
+
+    def decode(self, ids):
+        return [self.idx_to_item[idx] for idx in ids]
+
+    def __getitem__(self, idx):
+        return self.idx_to_item[idx]
+
+    def __len__(self):
+        return len(self.idx_to_item)
+
+    def __repr__(self):
+        return 'Vocabulary({} items)'.format(len(self))
+
+class LayeredVocabulary:
+    """
+    Vocabulary composed of a shared read-only base and a small private overlay
+
+    Arguments
+    ---------
+    base : Vocabulary or LayeredVocabulary
+        Shared vocabulary. It is never modified through this object.
+
+    Items of the base keep their ids. New items are interned to the overlay
+    and their ids follow the ids of the base.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.overlay = Vocabulary()
+
+    def get(self, item):
+        idx = self.base.get(item)
+        if idx is None:
+            idx = self.overlay.get(item)
+            if idx is not None:
+                idx += len(self.base)
+        return idx
+
+    def intern(self, item):
+        idx = self.get(item)
+        if idx is None:
+            idx = len(self.base) + self.overlay.intern(item)
+        return idx
+
+    def decode(self, ids):
+        return [self[idx] for idx in ids]
+
+    def __getitem__(self, idx):
+        n_base = len(self.base)
+        if idx < n_base:
+            return self.base[idx]
+        return self.overlay[idx - n_base]
+
+    def __len__(self):
+        return len(self.base) + len(self.overlay)
+
+    def __repr__(self):
+        return 'LayeredVocabulary(base={}, overlay={})'.format(len(self.base), len(self.overlay))
+
+class BulkAnalysis:
+    """
+    Analysis results of many words in CSR-style flat arrays
+
+    Attributes
+    ----------
+    offsets : numpy.ndarray or array.array
+        Length is (number of words + 1).
+        Analyses of i-th word are in range offsets[i]:offsets[i+1]
+    stem_ids, eomi_ids, tag_ids : numpy.ndarray or array.array
+        Stem id, eomi id and stem tag id of each analysis
+    stems, eomis, tags : Vocabulary
+        Vocabularies to decode ids
+
+    Arrays are numpy.ndarray of int32 if NumPy is installed, else array.array('i').
+
+    Usage
+    -----
+        >>> bulk = lemmatizer.analyze_bulk(['차가우니까', '한국어', '파랬다'])
+        >>> bulk.offsets
+        $ array([0, 1, 1, 2], dtype=int32)
+
+        >>> bulk.stems.decode(bulk.stem_ids)
+        $ ['차갑', '파랗']
+
+        >>> bulk[2]
+        $ [(('파랗', 'Adjective'), ('았다', 'Eomi'))]
+    """
+
+    def __init__(self, offsets, stem_ids, eomi_ids, tag_ids, stems, eomis, tags):
+        self.offsets = offsets
+        self.stem_ids = stem_ids
+        self.eomi_ids = eomi_ids
+        self.tag_ids = tag_ids
+        self.stems = stems
+        self.eomis = eomis
+        self.tags = tags
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        """
+        It returns decoded analysis of i-th word, same format with `Lemmatizer.analyze`
+        """
+
+        b, e = int(self.offsets[i]), int(self.offsets[i+1])
+        return [((self.stems[self.stem_ids[j]], self.tags[self.tag_ids[j]]),
+                 (self.eomis[self.eomi_ids[j]], EOMI)) for j in range(b, e)]
+
+def build_vocabularies(verbs, adjectives, eomis):
+    """
+    Returns
+    -------
+    stems, eomis, tags : Vocabulary
+        Stems and eomis in loaded dictionaries are interned in sorted order.
+        Morphemes added later by `Lemmatizer.add_words` are appended.
+    """
+
+    stems = Vocabulary(sorted(set(verbs) | set(adjectives)))
+    eomis = Vocabulary(sorted(eomis))
+    tags = Vocabulary([ADJECTIVE, VERB])
+    return stems, eomis, tags
+
+def to_array(values):
+    # NumPy is imported at the first bulk analysis, not with soylemma
+    try:
+        import numpy as np
+    except ImportError:
+        return array('i', values)
+    return np.asarray(values, dtype=np.int32)
+
+def to_ids(morphs, vocabularies):
+    """
+    Arguments
+    ---------
+    morphs : list of tuple
+        Analysis result, same format with `Lemmatizer.analyze`
+    vocabularies : (Vocabulary, Vocabulary, Vocabulary)
+        Stem, eomi and tag vocabularies
+
+    Returns
+    -------
+    stem_ids, eomi_ids, tag_ids : list of int
+    """
+
+    stems, eomis, tags = vocabularies
+    return ([stems.intern(stem) for (stem, _), _ in morphs],
+            [eomis.intern(eomi) for _, (eomi, _) in morphs],
+            [tags.intern(tag) for (_, tag), _ in morphs])
+
+def analyze_bulk(words, analyze_ids, vocabularies):
+    """
+    Arguments
+    ---------
+    words : list of str
+        Words to analyze
+    analyze_ids : callable
+        Function which returns (stem_ids, eomi_ids, tag_ids) aligned with distinct words
+    vocabularies : (Vocabulary, Vocabulary, Vocabulary)
+        Stem, eomi and tag vocabularies
+
+    Returns
+    -------
+    bulk : BulkAnalysis
+
+    Each distinct word is analyzed to ids once,
+    and repeated words only extend the flat arrays.
+    """
+
+    stems, eomis, tags = vocabularies
+    distinct = list(set(words))
+    word_to_ids = dict(zip(distinct, analyze_ids(distinct)))
+
+    offsets = [0]
+    stem_ids, eomi_ids, tag_ids = [], [], []
+    for word in words:
+        stem_ids_, eomi_ids_, tag_ids_ = word_to_ids[word]
+        stem_ids += stem_ids_
+        eomi_ids += eomi_ids_
+        tag_ids += tag_ids_
+        offsets.append(len(stem_ids))
+
+    return BulkAnalysis(to_array(offsets), to_array(stem_ids),
+        to_array(eomi_ids), to_array(tag_ids), stems, eomis, tags)
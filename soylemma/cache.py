@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class AnalysisCache:
+    """
+    Persistent on-disk cache of morphological analysis results
+
+    Arguments
+    ---------
+    path : str
+        SQLite database file path.
+        Several processes on one host can share the same file.
+        Each process and thread uses its own connection.
+    max_size : int
+        Maximum number of cached words.
+        When the cache is full, least recently used words are evicted.
+        Recency of cache hits is buffered in memory and written with the next
+        `set_many` or after `touch_batch_size` hits, so it is approximate.
+        A read skips writing the recency when another connection holds the write lock,
+        and the buffer is kept until the next write.
+    timeout : float
+        Seconds to wait for a lock held by another process
+
+    Every entry is keyed by (fingerprint, word).
+    The fingerprint is a hash of the loaded dictionaries and rules (see `dictionary_fingerprint`),
+    so results of a retrained or updated dictionary never mix with stale ones.
+    Stale entries are not touched anymore and they are evicted first.
+
+    Reads never wait for the write lock. The number of rows is kept in a counter table
+    updated in the same transaction as insertions and evictions.
+
+    Usage
+    -----
+
+        >>> from soylemma import Lemmatizer, AnalysisCache
+
+        >>> cache = AnalysisCache('analysis_cache.db', max_size=1000000)
+        >>> lemmatizer = Lemmatizer(cache=cache)
+        >>> lemmatizer.analyze_many(['차가우니까', '파랬다'])
+        $ [[(('차갑', 'Adjective'), ('우니까', 'Eomi'))],
+           [(('파랗', 'Adjective'), ('았다', 'Eomi'))]]
+    """
+
+    batch_size = 500
+    touch_batch_size = 10000
+
+    def __init__(self, path, max_size=1000000, timeout=30.0):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._initialize()
+
+    def _connection(self):
+        # sqlite connection must not be shared across threads or forked processes
+        local = self._local
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            local.conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            local.conn.execute('PRAGMA journal_mode=WAL')
+            local.conn.execute('PRAGMA synchronous=NORMAL')
+            local.pid = os.getpid()
+            # {(fingerprint, word):last used time} of cache hits not written yet
+            local.touched = {}
+        return local.conn
+
+    def _initialize(self):
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS analysis ('
+            'fingerprint TEXT NOT NULL, word TEXT NOT NULL, '
+            'morphs TEXT NOT NULL, last_used REAL NOT NULL, '
+            'PRIMARY KEY (fingerprint, word))')
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS analysis_last_used '
+            'ON analysis (last_used)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS analysis_size ('
+            'id INTEGER PRIMARY KEY CHECK (id = 0), n_rows INTEGER NOT NULL)')
+        # counts the rows of a cache file created without the counter table, once
+        conn.execute(
+            'INSERT OR IGNORE INTO analysis_size (id, n_rows) '
+            'SELECT 0, COUNT(*) FROM analysis')
+
+    def get_many(self, fingerprint, words):
+        """
+        Arguments
+        ---------
+        fingerprint : str
+            Dictionary fingerprint
+        words : collection of str
+            Words to look up
+
+        Returns
+        -------
+        cached : {str:list of tuple}
+            Analysis results of cached words. Missed words are not included.
+        """
+
+        words = list(set(words))
+        conn = self._connection()
+        cached = {}
+        for b in range(0, len(words), self.batch_size):
+            batch = words[b: b + self.batch_size]
+            query = 'SELECT word, morphs FROM analysis WHERE fingerprint = ? AND word IN ({})'.format(
+                ', '.join('?' * len(batch)))
+            for word, morphs in conn.execute(query, [fingerprint] + batch):
+                cached[word] = decode(morphs)
+        if cached:
+            now = time.time()
+            touched = self._local.touched
+            touched.update(((fingerprint, word), now) for word in cached)
+            if len(touched) >= self.touch_batch_size:
+                self._write(conn, [], blocking=False)
+        return cached
+
+    def set_many(self, fingerprint, results):
+        """
+        Arguments
+        ---------
+        fingerprint : str
+            Dictionary fingerprint
+        results : {str:list of tuple}
+            Analysis results to store. {word:morphs}
+        """
+
+        if not results:
+            return
+        now = time.time()
+        rows = [(fingerprint, word, encode(morphs), now) for word, morphs in results.items()]
+        self._write(self._connection(), rows)
+
+    def _write(self, conn, rows, blocking=True):
+        # one write transaction inserts rows, flushes buffered recency and evicts
+        touched = self._local.touched
+        if blocking:
+            conn.execute('BEGIN IMMEDIATE')
+        elif not self._try_begin(conn):
+            return
+        try:
+            if touched:
+                conn.executemany(
+                    'UPDATE analysis SET last_used = ? WHERE fingerprint = ? AND word = ?',
+                    [(now, fingerprint_, word) for (fingerprint_, word), now in touched.items()])
+            # a word written by another process meanwhile has the same analysis
+            n_rows = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO analysis (fingerprint, word, morphs, last_used) VALUES (?, ?, ?, ?)',
+                rows)
+            n_rows = conn.total_changes - n_rows
+            n_rows = self._update_size(conn, n_rows)
+            n_excess = n_rows - self.max_size
+            if n_excess > 0:
+                conn.execute(
+                    'DELETE FROM analysis WHERE rowid IN '
+                    '(SELECT rowid FROM analysis ORDER BY last_used LIMIT ?)',
+                    (n_excess,))
+                self._update_size(conn, -n_excess)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        touched.clear()
+
+    def _try_begin(self, conn):
+        # takes the write lock only if it is free, without waiting for `timeout`
+        conn.execute('PRAGMA busy_timeout = 0')
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            return True
+        except sqlite3.OperationalError:
+            return False
+        finally:
+            conn.execute('PRAGMA busy_timeout = {}'.format(int(self.timeout * 1000)))
+
+    def _update_size(self, conn, n_changes):
+        conn.execute('UPDATE analysis_size SET n_rows = n_rows + ? WHERE id = 0', (n_changes,))
+        return conn.execute('SELECT n_rows FROM analysis_size WHERE id = 0').fetchone()[0]
+
+    def purge(self, fingerprint=None):
+        """
+        Arguments
+        ---------
+        fingerprint : str or None
+            If None, remove all entries.
+            Else, remove entries of other fingerprints (stale dictionaries).
+        """
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if fingerprint is None:
+                conn.execute('DELETE FROM analysis')
+            else:
+                conn.execute('DELETE FROM analysis WHERE fingerprint != ?', (fingerprint,))
+            conn.execute('UPDATE analysis_size SET n_rows = (SELECT COUNT(*) FROM analysis) WHERE id = 0')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self._local.touched.clear()
+
+    def close(self):
+        local = self._local
+        if getattr(local, 'conn', None) is not None and local.pid == os.getpid():
+            if local.touched:
+                self._write(local.conn, [])
+            local.conn.close()
+        local.conn = None
+
+    def __len__(self):
+        conn = self._connection()
+        return conn.execute('SELECT n_rows FROM analysis_size WHERE id = 0').fetchone()[0]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+def encode(morphs):
+    return json.dumps(morphs, ensure_ascii=False)
+
+def decode(morphs):
+    return [tuple(tuple(morph) for morph in pair) for pair in json.loads(morphs)]
+
+def dictionary_fingerprint(verbs, adjectives, eomis, lemma_rules, jamo_rules=None):
+    """
+    Arguments
+    ---------
+    verbs, adjectives, eomis : collection of str
+        Dictionary set
+    lemma_rules : dict or None
+        Lemmatization rules. None if the lemmatizer applies only jamo rules
+    jamo_rules : JamoRules or None
+        Jamo-level rules, if the lemmatizer applies them
+
+    Returns
+    -------
+    fingerprint : str
+        Hex digest which changes whenever any word or rule changes
+    """
+
+    hasher = hashlib.sha1()
+    for tag, morphs in [('Verbs', verbs), ('Adjectives', adjectives), ('Eomis', eomis)]:
+        hasher.update(tag.encode('utf-8'))
+        for morph in sorted(morphs):
+            hasher.update(morph.encode('utf-8'))
+            hasher.update(b'\n')
+    hasher.update(b'rules')
+    for surface in sorted(lemma_rules or ()):
+        for stem, eomi in sorted(lemma_rules[surface]):
+            hasher.update('{} {} {}\n'.format(surface, stem, eomi).encode('utf-8'))
+    if jamo_rules is not None:
+        hasher.update(b'jamo')
+        for key, values in sorted(jamo_rules.patterns.items()):
+            for value, exceptions in sorted(values.items()):
+                hasher.update('{} {} {}\n'.format(key, value, exceptions).encode('utf-8'))
+        for surface in sorted(jamo_rules.rules):
+            for stem, eomi in sorted(jamo_rules.rules[surface]):
+                hasher.update('{} {} {}\n'.format(surface, stem, eomi).encode('utf-8'))
+    return hasher.hexdigest()
@@ -0,0 +1,335 @@
+import argparse
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+from .lemmatizer import Lemmatizer
+from .lemmatizer import to_lemmas
+
+
+# Protocol
+#
+# A request and a response are single lines of UTF-8 JSON.
+#
+#     request  : {"method": "analyze", "words": ["차가우니까", "파랬다"]}
+#     response : {"results": [[[["차갑", "Adjective"], ["우니까", "Eomi"]]], ...]}
+#     error    : {"error": "message"}
+#
+# A connection can send several requests, one by one.
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        lemmatizer = self.server.lemmatizer
+        for line in self.rfile:
+            try:
+                request = json.loads(line.decode('utf-8'))
+                if request.get('method') == 'ping':
+                    response = {'results': []}
+                elif request.get('method') == 'analyze':
+                    response = {'results': lemmatizer.analyze_many(request['words'])}
+                else:
+                    response = {'error': 'Unknown method {}'.format(request.get('method'))}
+            except Exception as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class LemmatizerWorker:
+    """
+    Socket server which analyzes words for `ShardedLemmatizerClient`
+
+    Arguments
+    ---------
+    lemmatizer : Lemmatizer
+        Lemmatizer of this node. Use `cache` to keep analysis of its own share.
+    host : str
+        Host name
+    port : int
+        Port. If 0, a free port is chosen.
+
+    Usage
+    -----
+        >>> worker = LemmatizerWorker(Lemmatizer(cache='node0.db'), port=8000)
+        >>> worker.serve_forever()
+
+    Or, from command line,
+
+        $ python -m soylemma.cluster --port 8000 --cache node0.db
+    """
+
+    def __init__(self, lemmatizer, host='127.0.0.1', port=0):
+        self.server = _Server((host, port), _RequestHandler)
+        self.server.lemmatizer = lemmatizer
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class ShardedLemmatizerClient:
+    """
+    Client which partitions words over workers by consistent hashing
+
+    Arguments
+    ---------
+    addresses : list of (str, int)
+        (host, port) of workers
+    replicas : int
+        Number of virtual nodes of each worker on the hash ring
+    timeout : float
+        Socket timeout seconds
+    retry_interval : float
+        Seconds before a failed worker is tried again by later calls.
+        Within one call, a failed worker is never tried again.
+
+    Each distinct word is always sent to the same worker while the worker is alive,
+    so the cache of each worker stays hot for its own share of vocabulary.
+    If a worker fails, its words are sent to the next workers on the ring.
+
+    Usage
+    -----
+        >>> client = ShardedLemmatizerClient([('10.0.0.1', 8000), ('10.0.0.2', 8000)])
+        >>> client.analyze_many(['차가우니까', '파랬다'])
+        $ [[(('차갑', 'Adjective'), ('우니까', 'Eomi'))],
+           [(('파랗', 'Adjective'), ('았다', 'Eomi'))]]
+    """
+
+    def __init__(self, addresses, replicas=64, timeout=30.0, retry_interval=10.0):
+        if not addresses:
+            raise ValueError('At least one worker address is required')
+        self.addresses = [tuple(address) for address in addresses]
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        ring = sorted((_hash('{}:{}#{}'.format(host, port, i)), (host, port))
+            for host, port in self.addresses for i in range(replicas))
+        self._ring_hashes = [h for h, _ in ring]
+        self._ring_nodes = [node for _, node in ring]
+        self._connections = {}
+        self._locks = {address: threading.Lock() for address in self.addresses}
+        # {address:time of failure}
+        self._failed = {}
+
+    def _alive(self, address):
+        failed_at = self._failed.get(address)
+        return failed_at is None or time.time() - failed_at > self.retry_interval
+
+    def node(self, word, excluded=()):
+        """
+        It returns the address of the first alive worker of the word on the hash ring,
+        or None if all workers are failed. Workers in `excluded` are skipped.
+        """
+
+        n = len(self._ring_nodes)
+        b = bisect(self._ring_hashes, _hash(word))
+        for i in range(n):
+            address = self._ring_nodes[(b + i) % n]
+            if not (address in excluded) and self._alive(address):
+                return address
+        return None
+
+    def _request(self, address, words):
+        with self._locks[address]:
+            try:
+                conn = self._connections.get(address)
+                if conn is None:
+                    sock = socket.create_connection(address, timeout=self.timeout)
+                    conn = (sock, sock.makefile('rwb'))
+                    self._connections[address] = conn
+                request = {'method': 'analyze', 'words': words}
+                conn[1].write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+                conn[1].flush()
+                line = conn[1].readline()
+                if not line:
+                    raise ConnectionError('Worker {}:{} closed connection'.format(*address))
+                try:
+                    response = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # truncated response, the connection is out of sync
+                    response = None
+                if not _is_valid_response(response, words):
+                    raise ConnectionError('Worker {}:{} sent a broken response'.format(*address))
+            except OSError:
+                self._close(address)
+                raise
+        if 'error' in response:
+            raise ValueError('Worker {}:{} failed: {}'.format(address[0], address[1], response['error']))
+        return response['results']
+
+    def _close(self, address):
+        conn = self._connections.pop(address, None)
+        if conn is not None:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def analyze_many(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to perform morphological analysis
+
+        Returns
+        -------
+        morphemes : list of list of tuple
+            Analysis results aligned with input words
+
+        Raises
+        ------
+        ConnectionError
+            If all workers are failed
+        """
+
+        results = {}
+        remain = list(set(words))
+        # workers failed in this call, even if retry_interval has passed
+        failed = set()
+        while remain:
+            partitions = {}
+            for word in remain:
+                address = self.node(word, failed)
+                if address is None:
+                    raise ConnectionError('All workers are failed')
+                partitions.setdefault(address, []).append(word)
+
+            remain = []
+            with ThreadPoolExecutor(len(partitions)) as executor:
+                futures = {address: executor.submit(self._request, address, words_)
+                           for address, words_ in partitions.items()}
+                for address, future in futures.items():
+                    try:
+                        for word, morphs in zip(partitions[address], future.result()):
+                            results[word] = [tuple(tuple(morph) for morph in pair) for pair in morphs]
+                    except OSError:
+                        # fail over to the next workers on the ring
+                        self._failed[address] = time.time()
+                        failed.add(address)
+                        remain += partitions[address]
+                    else:
+                        self._failed.pop(address, None)
+        return [results[word] for word in words]
+
+    def lemmatize_many(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to recover canonical form (lemma)
+
+        Returns
+        -------
+        lemmas : list of list of tuple
+            Lemmas aligned with input words
+        """
+
+        return [to_lemmas(morphs) for morphs in self.analyze_many(words)]
+
+    def close(self):
+        for address in list(self._connections):
+            self._close(address)
+
+def _is_valid_response(response, words):
+    # results must be aligned with the words of the request
+    if not isinstance(response, dict):
+        return False
+    if 'error' in response:
+        return True
+    results = response.get('results')
+    return isinstance(results, list) and len(results) == len(words)
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+def _run_worker(pipe, lemmatizer_kwargs):
+    worker = LemmatizerWorker(Lemmatizer(**lemmatizer_kwargs))
+    pipe.send(worker.address)
+    pipe.close()
+    worker.serve_forever()
+
+class LocalCluster:
+    """
+    Stand-in cluster of worker processes on this machine
+
+    Arguments
+    ---------
+    n_workers : int
+        Number of worker processes
+    lemmatizer_kwargs : dict
+        Lemmatizer arguments of the workers.
+        `cache` may contain '{}', which is replaced by the worker index.
+
+    Usage
+    -----
+        >>> with LocalCluster(n_workers=3, lemmatizer_kwargs={'cache': 'node{}.db'}) as cluster:
+        >>>     client = cluster.client()
+        >>>     client.analyze_many(['차가우니까', '파랬다'])
+        >>>     cluster.kill(0) # client fails over to the other workers
+        >>>     client.analyze_many(['차가우니까', '파랬다'])
+    """
+
+    def __init__(self, n_workers=2, lemmatizer_kwargs=None):
+        lemmatizer_kwargs = {} if lemmatizer_kwargs is None else lemmatizer_kwargs
+        self.processes = []
+        self.addresses = []
+        for i in range(n_workers):
+            kwargs = dict(lemmatizer_kwargs)
+            if isinstance(kwargs.get('cache'), str):
+                kwargs['cache'] = kwargs['cache'].format(i)
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_run_worker, args=(sender, kwargs), daemon=True)
+            process.start()
+            self.processes.append(process)
+            self.addresses.append(tuple(receiver.recv()))
+            receiver.close()
+
+    def client(self, **kwargs):
+        return ShardedLemmatizerClient(self.addresses, **kwargs)
+
+    def kill(self, i):
+        self.processes[i].terminate()
+        self.processes[i].join()
+
+    def close(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Host name')
+    parser.add_argument('--port', type=int, default=8000, help='Port')
+    parser.add_argument('--dictionary_name', type=str, default='default', help='Dictionary name')
+    parser.add_argument('--cache', type=str, default=None, help='Persistent analysis cache path')
+
+    args = parser.parse_args()
+    lemmatizer = Lemmatizer(dictionary_name=args.dictionary_name, cache=args.cache)
+    worker = LemmatizerWorker(lemmatizer, args.host, args.port)
+    print('Serving soylemma worker at {}:{}'.format(*worker.address))
+    worker.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor
+from .aio import _analyze_in_worker
+from .aio import _initialize_worker
+from .lemmatizer import to_lemmas
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+
+def lemmatize_column(lemmatizer, values, n_jobs=1, chunk_size=10000):
+    """
+    Arguments
+    ---------
+    lemmatizer : Lemmatizer
+        Lemmatizer
+    values : numpy.ndarray, pandas.Series, pyarrow.Array, pyarrow.ChunkedArray or list of str
+        Column of words
+    n_jobs : int
+        Number of processes to lemmatize unique words. If 1, it runs in this process.
+    chunk_size : int
+        Number of unique words sent to a process at once
+
+    Returns
+    -------
+    columns : dict, pandas.DataFrame or pyarrow.Table
+        Three columns aligned with the input
+        - lemma : the first lemma, or None
+        - tag : tag of the first lemma, or None
+        - lemmas : list of all distinct lemmas (str)
+        Lemmas of a word are sorted by (lemma, tag), so the first lemma does not depend
+        on the order of analyses.
+        If the input is pandas.Series, it returns DataFrame with the same index.
+        If the input is pyarrow array, it returns pyarrow.Table.
+        Else, it returns dict of numpy object arrays.
+
+    The column is factorized to unique words, the lemmatizer runs only over the uniques,
+    and the results are scattered back by integer indexing, without per-row Python calls.
+    Missing values (None, NaN, null) get None lemma, None tag and None lemmas.
+    Rows with the same word share the same `lemmas` list object.
+
+    NumPy is required. pandas and PyArrow are optional. Without pandas, a NumPy or list
+    input must not contain missing values.
+
+    Usage
+    -----
+        >>> import pandas as pd
+        >>> from soylemma.columnar import lemmatize_column
+
+        >>> series = pd.Series(['차가우니까', '한국어', '파랬다', '차가우니까'])
+        >>> lemmatize_column(lemmatizer, series)
+        $     lemma        tag   lemmas
+          0  차갑다  Adjective  [차갑다]
+          1    None       None       []
+          2  파랗다  Adjective  [파랗다]
+          3  차갑다  Adjective  [차갑다]
+    """
+
+    if pa is not None and isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return _lemmatize_arrow(lemmatizer, values, n_jobs, chunk_size)
+
+    if np is None:
+        raise ImportError('lemmatize_column requires numpy. Install it with `pip install numpy`')
+
+    if pd is not None and isinstance(values, pd.Series):
+        codes, uniques = pd.factorize(values)
+        columns = _lemmatize_numpy(lemmatizer, codes, uniques, n_jobs, chunk_size)
+        return pd.DataFrame(columns, index=values.index)
+
+    if pd is not None:
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    else:
+        uniques, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return _lemmatize_numpy(lemmatizer, codes, uniques, n_jobs, chunk_size)
+
+def _lemmatize_uniques(lemmatizer, uniques, n_jobs, chunk_size):
+    uniques = [str(word) for word in uniques]
+    if n_jobs == 1 or len(uniques) <= chunk_size:
+        lemmas = lemmatizer.lemmatize_many(uniques)
+    else:
+        chunks = [uniques[b: b + chunk_size] for b in range(0, len(uniques), chunk_size)]
+        with ProcessPoolExecutor(n_jobs, initializer=_initialize_worker, initargs=(lemmatizer,)) as executor:
+            lemmas = [to_lemmas(morphs) for analyzed in executor.map(_analyze_in_worker, chunks)
+                      for morphs in analyzed]
+    # analyses are collected in a set, so their order depends on hash seed
+    return [sorted(lemmas_i) for lemmas_i in lemmas]
+
+def _distinct_lemmas(lemmas_i):
+    # a lemma tagged both Adjective and Verb appears once
+    return list(dict.fromkeys(lemma for lemma, _ in lemmas_i))
+
+def _lemmatize_numpy(lemmatizer, codes, uniques, n_jobs, chunk_size):
+    lemmas = _lemmatize_uniques(lemmatizer, uniques, n_jobs, chunk_size)
+
+    # the last slot is for missing values, whose code is -1
+    n = len(lemmas)
+    first = np.empty(n + 1, dtype=object)
+    tags = np.empty(n + 1, dtype=object)
+    lemmas_ = np.empty(n + 1, dtype=object)
+    for i, lemmas_i in enumerate(lemmas):
+        if lemmas_i:
+            first[i], tags[i] = lemmas_i[0]
+        lemmas_[i] = _distinct_lemmas(lemmas_i)
+
+    codes = np.asarray(codes)
+    return {'lemma': first[codes], 'tag': tags[codes], 'lemmas': lemmas_[codes]}
+
+def _lemmatize_arrow(lemmatizer, values, n_jobs, chunk_size):
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    encoded = values.dictionary_encode()
+    lemmas = _lemmatize_uniques(lemmatizer, encoded.dictionary.to_pylist(), n_jobs, chunk_size)
+
+    first = pa.array([lemmas_i[0][0] if lemmas_i else None for lemmas_i in lemmas], type=pa.string())
+    tags = pa.array([lemmas_i[0][1] if lemmas_i else None for lemmas_i in lemmas], type=pa.string())
+    lemmas_ = pa.array([_distinct_lemmas(lemmas_i) for lemmas_i in lemmas], type=pa.list_(pa.string()))
+
+    # null indices (missing values) are taken as null
+    indices = encoded.indices
+    return pa.table({
+        'lemma': pc.take(first, indices),
+        'tag': pc.take(tags, indices),
+        'lemmas': pc.take(lemmas_, indices)
+    })
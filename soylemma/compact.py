@@ -0,0 +1,185 @@
+from array import array
+from zlib import crc32
+
+
+class CompactMorphemeSet:
+    """
+    Read-mostly morpheme set stored in two contiguous arrays
+
+    Arguments
+    ---------
+    morphs : collection of str
+        Morphemes
+
+    Morphemes are sorted and concatenated into one UTF-8 blob,
+    and `offsets[i]:offsets[i+1]` is the byte span of i-th morpheme.
+    UTF-8 preserves the order of code points, so binary search on the blob
+    gives prefix query without any per-morpheme object. Membership test looks up
+    an open addressing table of morpheme indices hashed by crc32, so it compares
+    the key with one or two morphemes instead of slicing the blob at every probe.
+    It uses a few bytes per morpheme, instead of a str object and a hash entry of `set`.
+
+    Updating the set rebuilds the arrays. Use it for dictionaries which are
+    loaded once and updated rarely.
+
+    Usage
+    -----
+        >>> morphs = CompactMorphemeSet(['가', '가깝', '먹'])
+        >>> '가깝' in morphs
+        $ True
+
+        >>> list(morphs.startswith('가'))
+        $ ['가', '가깝']
+
+        >>> CompactMorphemeSet.from_bytes(morphs.to_bytes()) == morphs
+        $ True
+    """
+
+    def __init__(self, morphs=()):
+        self._build(morphs)
+
+    def _build(self, morphs):
+        encoded = sorted({morph.encode('utf-8') for morph in morphs})
+        offsets = array('I', [0])
+        end = 0
+        for morph in encoded:
+            end += len(morph)
+            offsets.append(end)
+        self.blob = b''.join(encoded)
+        self.offsets = offsets
+        self._build_table()
+
+    def _build_table(self):
+        # slot has (index + 1) of morpheme, or 0 if it is empty.
+        # load factor is below 0.5, so a missing key meets an empty slot soon.
+        # crc32 does not depend on the process, so a pickled table stays valid.
+        n = len(self)
+        size = 2 * n + 1
+        table = array('H' if n < 0xFFFF else 'I', [0]) * size
+        for i in range(n):
+            slot = crc32(self._get(i)) % size
+            while table[slot]:
+                slot = (slot + 1) % size
+            table[slot] = i + 1
+        self._table = table
+
+    def _get(self, i):
+        return self.blob[self.offsets[i]: self.offsets[i+1]]
+
+    def _bisect(self, key):
+        # lower bound of key in the sorted blob
+        blob, offsets = self.blob, self.offsets
+        begin, end = 0, len(offsets) - 1
+        while begin < end:
+            mid = (begin + end) // 2
+            if blob[offsets[mid]: offsets[mid+1]] < key:
+                begin = mid + 1
+            else:
+                end = mid
+        return begin
+
+    def __contains__(self, morph):
+        if not isinstance(morph, str):
+            return False
+        key = morph.encode('utf-8')
+        blob, offsets, table = self.blob, self.offsets, self._table
+        size = len(table)
+        slot = crc32(key) % size
+        i = table[slot]
+        while i:
+            if blob[offsets[i-1]: offsets[i]] == key:
+                return True
+            slot = (slot + 1) % size
+            i = table[slot]
+        return False
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._get(i).decode('utf-8')
+
+    def __eq__(self, other):
+        if isinstance(other, CompactMorphemeSet):
+            return self.blob == other.blob and self.offsets == other.offsets
+        if isinstance(other, (set, frozenset)):
+            return set(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return 'CompactMorphemeSet({} morphemes, {} bytes)'.format(len(self), len(self.blob))
+
+    def startswith(self, prefix):
+        """
+        Arguments
+        ---------
+        prefix : str
+            Prefix of morphemes
+
+        Yields
+        ------
+        morph : str
+            Morphemes which start with the prefix, in sorted order
+        """
+
+        key = prefix.encode('utf-8')
+        for i in range(self._bisect(key), len(self)):
+            morph = self._get(i)
+            if not morph.startswith(key):
+                break
+            yield morph.decode('utf-8')
+
+    def has_prefix(self, prefix):
+        """
+        It returns True if any morpheme starts with the prefix
+        """
+
+        key = prefix.encode('utf-8')
+        i = self._bisect(key)
+        return i < len(self) and self._get(i).startswith(key)
+
+    def add(self, morph):
+        if not (morph in self):
+            self.update({morph})
+
+    def update(self, morphs):
+        morphs = [morph for morph in morphs if not (morph in self)]
+        if morphs:
+            self._build(list(self) + morphs)
+
+    def to_bytes(self):
+        """
+        Returns
+        -------
+        serialized : bytes
+            Number of morphemes (4 bytes, little endian), offsets and blob
+        """
+
+        offsets = array('I', self.offsets)
+        if array('I', [1]).tobytes()[0] != 1:
+            offsets.byteswap()
+        return len(self).to_bytes(4, 'little') + offsets.tobytes() + self.blob
+
+    @classmethod
+    def from_bytes(cls, serialized):
+        n = int.from_bytes(serialized[:4], 'little')
+        offsets = array('I')
+        end = 4 + offsets.itemsize * (n + 1)
+        offsets.frombytes(serialized[4: end])
+        if array('I', [1]).tobytes()[0] != 1:
+            offsets.byteswap()
+        morphs = cls()
+        morphs.offsets = offsets
+        morphs.blob = bytes(serialized[end:])
+        morphs._build_table()
+        return morphs
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
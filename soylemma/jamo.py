@@ -0,0 +1,399 @@
+from collections import defaultdict
+import copy
+from .automaton import LayeredAutomaton
+from .automaton import RuleAutomaton
+from .hangle import decompose
+from .hangle import jong_to_idx
+from .hangle import jung_to_idx
+from .hangle import kor_begin, cho_base, jung_base
+from .layered import LayeredRules
+from .utils import VERB, ADJECTIVE, EOMI
+
+
+# Pattern notation
+#
+# A jamo pattern rewrites the last syllable of a stem, whose chosung never changes
+# in conjugation, and the following `tail` syllables of the surface.
+#
+#     key   : (jungsung, jongsung, tail) of the surface
+#     value : (jungsung, jongsung, eomi) of the canonical form
+#
+# '*' as jungsung means that the jungsung is not changed. The common suffix of
+# tail and eomi is removed, because it is copied from the word. For example,
+#
+#     rules   : 가워 = 갑 + 어, 더워 = 덥 + 어, 추워 = 춥 + 어
+#     pattern : ('*', ' ', '워') -> ('*', 'ㅂ', '어')
+#
+#     rules   : 했 = 하 + 았, 갰 = 가 + 았, 했다 = 하 + 았다
+#     pattern : ('ㅐ', 'ㅆ', '') -> ('ㅏ', ' ', '았')
+#
+# Syllables where a pattern must not be applied are stored as its exceptions.
+# In a rule file, a pattern is written in one line as
+#
+#     @*_워 *ㅂ어 [exceptions]
+#
+# where '_' is an empty jongsung, and the eomi follows the jongsung of value.
+# Syllable-level rules are written as in rules.txt.
+
+class JamoRules:
+    """
+    Lemmatization rules generalized at jamo level
+
+    Arguments
+    ---------
+    patterns : dict
+        {(jung, jong, tail): {(jung, jong, eomi): exceptions}}
+        exceptions is str of syllables where the pattern is not applied.
+        See `generalize_rules`
+    rules : dict of set
+        Residual syllable-level lemma rules which are not covered by patterns
+
+    A pattern is applied at every syllable whose jungsung, jongsung and following
+    `tail` syllables match the key, so one pattern replaces syllable-level rules
+    of all chosungs.
+
+    Usage
+    -----
+        >>> jamo_rules = JamoRules.load('soylemma/dictionary/default/jamo_rules.txt')
+        >>> jamo_rules.find_conjugations('파랬다', eomis=eomis, stems=[verbs, adjectives])
+        $ {1: [('파랗', '았다', ('랬', '랗', '았'), (('ㅐ', 'ㅆ', ''), ('ㅏ', 'ㅎ', '았')))]}
+    """
+
+    def __init__(self, patterns=None, rules=None):
+        self.patterns = {} if patterns is None else patterns
+        self.rules = {} if rules is None else rules
+        self.automaton = RuleAutomaton(self.rules)
+        self._build_index()
+
+    def _build_index(self):
+        # {jungsung index * 28 + jongsung index:(max length of tails, {tail:[(code shift, eomi, exceptions, pattern)]})}
+        # Chosung is kept, so the code of stem syllable is the code of surface syllable
+        # shifted by the change of jungsung and jongsung.
+        index = {}
+        for (jung, jong, tail), values in self.patterns.items():
+            jungs = range(len(jung_to_idx)) if jung == '*' else [jung_to_idx[jung]]
+            for (jung_, jong_, eomi), exceptions in values.items():
+                pattern = ((jung, jong, tail), (jung_, jong_, eomi))
+                for j in jungs:
+                    shift = jong_to_idx[jong_] - jong_to_idx[jong]
+                    if jung != '*':
+                        shift += jung_base * (jung_to_idx[jung_] - j)
+                    key = j * jung_base + jong_to_idx[jong]
+                    index.setdefault(key, {}).setdefault(tail, []).append(
+                        (shift, eomi, exceptions, pattern))
+        self._index = {key: (max(len(tail) for tail in tails), tails) for key, tails in index.items()}
+
+    def __len__(self):
+        """
+        Number of rows, patterns and residual rules
+        """
+
+        return (sum(len(values) for values in self.patterns.values())
+                + sum(len(canons) for canons in self.rules.values()))
+
+    def __repr__(self):
+        return 'JamoRules({} patterns, {} exceptions, {} rules)'.format(
+            sum(len(values) for values in self.patterns.values()),
+            sum(len(exceptions) for values in self.patterns.values() for exceptions in values.values()),
+            sum(len(canons) for canons in self.rules.values()))
+
+    def find_conjugations(self, word, begin=0, eomis=None, stems=None, end=None):
+        """
+        Arguments
+        ---------
+        word : str
+            A word to analyze its morphology
+        begin : int
+            The first position checked as the last syllable of stem
+        eomis : set of str or None
+            If given, candidates whose eomi is not in eomis are skipped
+        stems : list of set of str or None
+            If given, candidates whose stem is not in any of them are skipped.
+            For example, [verbs, adjectives]
+        end : int or None
+            The positions before `end` are checked. If None, until the end of the word.
+
+        Returns
+        -------
+        conjugations : dict
+            {position:[(stem, eomi, rule, pattern), ...]}
+            position is the last syllable of stem. rule is the syllable-level rule
+            (surface, canonical stem, canonical eomi) equivalent to the pattern
+            at the position, and pattern is (key, value).
+        """
+
+        conjugations = {}
+        index = self._index
+        n = len(word)
+        for i in range(begin, n if end is None else end):
+            c = word[i]
+            if not ('가' <= c <= '힣'):
+                continue
+            code = ord(c)
+            tails = index.get((code - kor_begin) % cho_base)
+            if tails is None:
+                continue
+            max_tail, tails = tails
+            tail_end = min(i + 2 + max_tail, n + 1)
+            for e in range(i + 1, tail_end):
+                entries = tails.get(word[i+1:e])
+                if not entries:
+                    continue
+                r_ = word[e:]
+                for shift, eomi, exceptions, pattern in entries:
+                    if c in exceptions:
+                        continue
+                    eomi_ = eomi + r_
+                    if eomis is not None and not (eomi_ in eomis):
+                        continue
+                    syllable = chr(code + shift)
+                    stem = word[:i] + syllable
+                    if stems is not None:
+                        for dictionary in stems:
+                            if stem in dictionary:
+                                break
+                        else:
+                            continue
+                    conjugations.setdefault(i, []).append(
+                        (stem, eomi_, (word[i:e], syllable, eomi), pattern))
+        return conjugations
+
+    def overlay(self):
+        """
+        Returns
+        -------
+        jamo_rules : JamoRules
+            Rules which share patterns, their index, residual rules and automaton
+            of this object as read-only base layers. `add_rules` of the returned
+            object updates only its own overlay.
+        """
+
+        jamo_rules = copy.copy(self)
+        jamo_rules.rules = LayeredRules(self.rules)
+        jamo_rules.automaton = LayeredAutomaton(self.automaton)
+        return jamo_rules
+
+    def add_rules(self, rules):
+        """
+        Arguments
+        ---------
+        rules : dict of set
+            Syllable-level lemma rules. They are added to the residual rules.
+        """
+
+        for surface, canons in rules.items():
+            # copy, because the residual rules may be shared with overlays
+            canons_ = set(self.rules.get(surface, set()))
+            canons_.update(canons)
+            self.rules[surface] = canons_
+        if isinstance(self.automaton, LayeredAutomaton):
+            # compile only the private surfaces, the base automaton is shared
+            base = self.rules.base
+            self.automaton = LayeredAutomaton(self.automaton.base,
+                [surface for surface in self.rules.overlay if not (surface in base)])
+        else:
+            self.automaton = RuleAutomaton(self.rules)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for (jung, jong, tail), values in sorted(self.patterns.items()):
+                for (jung_, jong_, eomi), exceptions in sorted(values.items()):
+                    cols = ['@' + jung + _escape(jong) + tail, jung_ + _escape(jong_) + eomi]
+                    if exceptions:
+                        cols.append(exceptions)
+                    f.write(' '.join(cols) + '\n')
+            for surface, canons in sorted(self.rules.items()):
+                for stem, eomi in sorted(canons):
+                    f.write('{} {} {}\n'.format(surface, stem, eomi))
+
+    @classmethod
+    def load(cls, path):
+        patterns = defaultdict(lambda: {})
+        rules = defaultdict(lambda: set())
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                cols = line.split()
+                if not cols:
+                    continue
+                if cols[0][0] == '@':
+                    key, value = cols[0], cols[1]
+                    exceptions = cols[2] if len(cols) == 3 else ''
+                    key = (key[1], _unescape(key[2]), key[3:])
+                    value = (value[0], _unescape(value[1]), value[2:])
+                    patterns[key][value] = exceptions
+                else:
+                    surface, stem, eomi = cols if len(cols) == 3 else (cols[0], cols[1], '아')
+                    rules[surface].add((stem, eomi))
+        return cls(dict(patterns), dict(rules))
+
+def _escape(jong):
+    return '_' if jong == ' ' else jong
+
+def _unescape(jong):
+    return ' ' if jong == '_' else jong
+
+def to_pattern(surface, stem, eomi):
+    """
+    Arguments
+    ---------
+    surface, stem, eomi : str
+        A syllable-level lemma rule
+
+    Returns
+    -------
+    pattern : ((str, str, str), (str, str, str)) or None
+        (key, value) of the rule. None if the rule cannot be generalized,
+        that is, the canonical stem is not one syllable or its chosung is
+        different from that of the first surface syllable.
+        If surface is stem + eomi, the pattern is (('*', jong, ''), ('*', jong, '')).
+
+    Usage
+    -----
+        >>> to_pattern('추워', '춥', '어')
+        $ (('*', ' ', '워'), ('*', 'ㅂ', '어'))
+
+        >>> to_pattern('했', '하', '았')
+        $ (('ㅐ', 'ㅆ', ''), ('ㅏ', ' ', '았'))
+    """
+
+    if not (len(stem) == 1 and '가' <= stem <= '힣' and '가' <= surface[0] <= '힣'):
+        return None
+    cho, jung, jong = decompose(surface[0], ensure_input=True)
+    cho_, jung_, jong_ = decompose(stem, ensure_input=True)
+    if cho != cho_:
+        return None
+    tail = surface[1:]
+    while tail and eomi and tail[-1] == eomi[-1]:
+        tail, eomi = tail[:-1], eomi[:-1]
+    if jung == jung_:
+        jung = jung_ = '*'
+    return (jung, jong, tail), (jung_, jong_, eomi)
+
+def _find_supports(lemma_rules):
+    # {(key, value):{(surface, stem, eomi)}}
+    supports = defaultdict(lambda: set())
+    residual = defaultdict(lambda: set())
+    for surface, canons in lemma_rules.items():
+        for stem, eomi in canons:
+            # the eomi of a surface longer than 2 syllables is followed by its
+            # third syllable (see `iter_lemma_candidates`), which patterns do not express
+            pattern = to_pattern(surface, stem, eomi) if len(surface) <= 2 else None
+            if pattern is None:
+                residual[surface].add((stem, eomi))
+            # surface = stem + eomi is same with the split without conjugation
+            elif not _is_identity(pattern):
+                supports[pattern].add((surface, stem, eomi))
+    return supports, residual
+
+def _is_identity(pattern):
+    (jung, jong, tail), (jung_, jong_, eomi) = pattern
+    return jung == '*' and jong == jong_ and not tail and not eomi
+
+def generalize_rules(lemma_rules, min_support=3):
+    """
+    Arguments
+    ---------
+    lemma_rules : dict of set
+        Syllable-level lemma rules
+    min_support : int
+        Minimum number of syllable-level rules which share a pattern.
+        Rules of rarer patterns remain syllable-level rules.
+
+    Returns
+    -------
+    jamo_rules : JamoRules
+
+    Patterns also match syllables which were not observed in training,
+    so analyses of the returned rules are a superset of those of `lemma_rules`.
+    Rules whose surface is stem + eomi are removed, because the split without
+    conjugation makes the same candidates.
+    Use `fit_jamo_rules` to keep analyses exactly same on a corpus.
+
+    Usage
+    -----
+        >>> lemma_rules = {'했': {('하', '았')}, '갰': {('가', '았')}, '랬': {('라', '았')}}
+        >>> generalize_rules(lemma_rules).patterns
+        $ {('ㅐ', 'ㅆ', ''): {('ㅏ', ' ', '았'): ''}}
+    """
+
+    supports, residual = _find_supports(lemma_rules)
+    patterns = defaultdict(lambda: {})
+    for (key, value), rules in supports.items():
+        if len(rules) >= min_support:
+            patterns[key][value] = ''
+            continue
+        for surface, stem, eomi in rules:
+            residual[surface].add((stem, eomi))
+    return JamoRules(dict(patterns), dict(residual))
+
+def fit_jamo_rules(lemma_rules, words, verbs, adjectives, eomis, min_support=2):
+    """
+    Arguments
+    ---------
+    lemma_rules : dict of set
+        Syllable-level lemma rules
+    words : iterable of str
+        Words of corpus, for example eojeols of training data.
+        They are read once, so a generator over a large table is fine.
+    verbs, adjectives, eomis : set of str
+        Dictionaries
+    min_support : int
+        See `generalize_rules`
+
+    Returns
+    -------
+    jamo_rules : JamoRules
+        Generalized rules whose analyses of `words` are same with those of `lemma_rules`
+
+    Patterns never lose analyses of syllable-level rules. If a pattern makes an analysis
+    which `lemma_rules` does not make on some word, the syllable is added to exceptions
+    of the pattern, and the syllable-level rules of that syllable are kept as residual rules.
+    If the pattern with its exceptions is not smaller than its syllable-level rules,
+    it is turned back to them. Neither of them adds any analysis,
+    so one pass over the words is enough.
+
+    Usage
+    -----
+        >>> from soylemma import Lemmatizer
+        >>> from soylemma.jamo import fit_jamo_rules
+
+        >>> lemmatizer = Lemmatizer()
+        >>> jamo_rules = fit_jamo_rules(lemmatizer.lemma_rules, eojeols,
+        >>>     lemmatizer.verbs, lemmatizer.adjectives, lemmatizer.eomis)
+        >>> jamo_rules.save('soylemma/dictionary/default/jamo_rules.txt')
+    """
+
+    from .lemmatizer import analyze_morphology
+
+    candidates = generalize_rules(lemma_rules, min_support)
+    automaton = RuleAutomaton(lemma_rules)
+    stems = [verbs, adjectives]
+
+    # {pattern:{syllable}} where the pattern makes new analyses
+    blocks = defaultdict(lambda: set())
+    for word in words:
+        morphs = None
+        for i, conjugations in candidates.find_conjugations(word, 0, eomis, stems).items():
+            for stem, eomi, _, pattern in conjugations:
+                tags = [tag for tag, dictionary in ((ADJECTIVE, adjectives), (VERB, verbs))
+                        if stem in dictionary]
+                if morphs is None:
+                    morphs = set(analyze_morphology(
+                        word, verbs, adjectives, eomis, lemma_rules, automaton=automaton))
+                if any(not (((stem, tag), (eomi, EOMI)) in morphs) for tag in tags):
+                    blocks[pattern].add(word[i])
+
+    supports, residual = _find_supports(lemma_rules)
+    patterns = defaultdict(lambda: {})
+    for (key, value), rules in supports.items():
+        blocked = blocks.get((key, value), set())
+        covered = {rule for rule in rules if not (rule[0][0] in blocked)}
+        # a pattern and each of its exceptions are counted as one row
+        if value in candidates.patterns.get(key, {}) and 1 + len(blocked) < len(covered):
+            patterns[key][value] = ''.join(sorted(blocked))
+        else:
+            covered = set()
+        for surface, stem, eomi in rules:
+            if not ((surface, stem, eomi) in covered):
+                residual[surface].add((stem, eomi))
+    return JamoRules(dict(patterns), dict(residual))
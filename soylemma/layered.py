@@ -0,0 +1,98 @@
+class LayeredMorphemeSet:
+    """
+    Morpheme set composed of a shared read-only base and a small private overlay
+
+    Arguments
+    ---------
+    base : set of str or CompactMorphemeSet
+        Shared dictionary. It is never modified through this object.
+    overlay : set of str or None
+        Private additions. If None, an empty set is used.
+
+    Membership test checks the overlay first, then the base.
+    Added morphemes go to the overlay only, so memory grows with the overlay size.
+    """
+
+    def __init__(self, base, overlay=None):
+        self.base = base
+        self.overlay = set() if overlay is None else overlay
+
+    def __contains__(self, morph):
+        return morph in self.overlay or morph in self.base
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.overlay
+
+    def __len__(self):
+        return len(self.base) + len(self.overlay)
+
+    def __repr__(self):
+        return 'LayeredMorphemeSet(base={}, overlay={})'.format(len(self.base), len(self.overlay))
+
+    def add(self, morph):
+        if not (morph in self.base):
+            self.overlay.add(morph)
+
+    def update(self, morphs):
+        base = self.base
+        self.overlay.update(morph for morph in morphs if not (morph in base))
+
+class LayeredRules:
+    """
+    Rule table composed of a shared read-only base and a small private overlay
+
+    Arguments
+    ---------
+    base : dict of set
+        Shared lemma rules or conjugate rules. It is never modified through this object.
+    overlay : dict of set or None
+        Private rules. If None, an empty dict is used.
+
+    A key stored in the overlay holds the union of base and private values,
+    so lookup is a single `dict.get` on the overlay and, if missed, on the base.
+    Writing a key copies only that key's values into the overlay.
+    """
+
+    def __init__(self, base, overlay=None):
+        self.base = base
+        self.overlay = {} if overlay is None else overlay
+
+    def get(self, key, default=None):
+        values = self.overlay.get(key)
+        if values is None:
+            return self.base.get(key, default)
+        return values
+
+    def __getitem__(self, key):
+        values = self.get(key)
+        if values is None:
+            raise KeyError(key)
+        return values
+
+    def __setitem__(self, key, values):
+        self.overlay[key] = values
+
+    def __contains__(self, key):
+        return key in self.overlay or key in self.base
+
+    def __iter__(self):
+        yield from self.overlay
+        for key in self.base:
+            if not (key in self.overlay):
+                yield key
+
+    def __len__(self):
+        return len(self.base) + sum(1 for key in self.overlay if not (key in self.base))
+
+    def __repr__(self):
+        return 'LayeredRules(base={}, overlay={})'.format(len(self.base), len(self.overlay))
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (self.get(key) for key in self)
+
+    def items(self):
+        return ((key, self.get(key)) for key in self)
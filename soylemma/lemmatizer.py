@@ -1,4 +1,21 @@
 from collections import defaultdict
+import copy
+import os
+import time
+from .automaton import LayeredAutomaton
+from .automaton import RuleAutomaton
+from .bulk import analyze_bulk
+from .bulk import build_vocabularies
+from .bulk import LayeredVocabulary
+from .bulk import to_ids
+from .cache import AnalysisCache
+from .cache import dictionary_fingerprint
+from .compact import CompactMorphemeSet
+from .jamo import JamoRules
+from .jamo import generalize_rules
+from .layered import LayeredMorphemeSet
+from .layered import LayeredRules
+from .memory import memory_usage
 from .utils import installpath
 from .utils import VERB, ADJECTIVE, EOMI
 
@@ -30,6 +47,39 @@ class Lemmatizer:
             |-- Eomis.txt
             |-- Verbs.txt
             |-- rules.txt
+        and it may have jamo_rules.txt (see `rule_representation`)
+    cache : AnalysisCache, str or None
+        Persistent analysis cache shared across runs.
+        If str, it is used as the cache file path.
+        Cached results are keyed by the fingerprint of dictionaries and rules,
+        so updating them never returns stale analysis.
+        It is used by `analyze_many` and the methods built on it. `analyze` of a single
+        word does not use it, because a database round trip costs more than the analysis.
+    dictionary_backend : str
+        Storage of verbs, adjectives and eomis. Choice from ['set', 'compact'].
+        'compact' stores each dictionary as `CompactMorphemeSet`, a sorted UTF-8 blob
+        with an offset array. It uses several times less memory than `set`,
+        but membership test is slower.
+    max_length : int or None
+        Maximum number of characters checked as conjugation point.
+        For a longer word, only the trailing window of `max_length` characters,
+        where an eomi can occur, is analyzed. The stem still spans the whole prefix.
+    max_candidates : int or None
+        Maximum number of (stem, eomi) candidates checked per word.
+        Candidates are generated from the end of the word, so short eomis are checked first.
+    time_budget : float or None
+        Maximum seconds spent per word.
+        Analysis which exceeds one of these limits is reported as truncated
+        (see `analyze(word, return_truncated=True)`), and it is not stored in cache.
+    rule_representation : str
+        Choice from ['syllable', 'jamo'].
+        'jamo' applies rules generalized at jamo level (`soylemma.jamo.JamoRules`),
+        loaded from jamo_rules.txt of the dictionary. The table is less than half of
+        rules.txt, and its analyses are same with syllable-level rules on the training corpus.
+        If `lemma_rules` is given or the dictionary has no jamo_rules.txt, the rules are
+        generalized without a corpus, so they may find more analyses than syllable-level rules.
+        With 'jamo', the syllable-level rules are not kept: `lemma_rules` and `rule_automaton`
+        are None, and only `conjugate_rules` remain for `conjugate`.
 
     Usage
     -----
@@ -51,10 +101,15 @@ class Lemmatizer:
     """
 
     def __init__(self, verbs=None, adjectives=None,
-        eomis=None, lemma_rules=None, dictionary_name='default'):
+        eomis=None, lemma_rules=None, dictionary_name='default', cache=None,
+        dictionary_backend='set', max_length=None, max_candidates=None, time_budget=None,
+        rule_representation='syllable'):
 
         verbs, adjectives, eomis = self._check_dictionary(
-            verbs, adjectives, eomis, dictionary_name)
+            verbs, adjectives, eomis, dictionary_name, dictionary_backend)
+
+        jamo_rules = self._check_jamo_rules(
+            lemma_rules, dictionary_name, rule_representation)
 
         lemma_rules, conjugate_rules = self._check_rules(
             lemma_rules, dictionary_name)
@@ -62,10 +117,41 @@ class Lemmatizer:
         self.verbs = verbs
         self.adjectives = adjectives
         self.eomis = eomis
-        self.lemma_rules = lemma_rules
         self.conjugate_rules = conjugate_rules
+        if rule_representation == 'jamo':
+            if jamo_rules is None:
+                jamo_rules = generalize_rules(lemma_rules)
+            # jamo rules replace syllable-level rules in analysis,
+            # and `conjugate` needs only conjugate_rules
+            lemma_rules, rule_automaton = None, None
+        else:
+            rule_automaton = RuleAutomaton(lemma_rules)
+        self.lemma_rules = lemma_rules
+        self.rule_automaton = rule_automaton
+        self.jamo_rules = jamo_rules
+
+        if isinstance(cache, str):
+            cache = AnalysisCache(cache)
+        self.cache = cache
+        self._fingerprint = None
+        self._vocabularies = None
 
-    def _check_dictionary(self, verbs, adjectives, eomis, dictionary_name):
+        self.max_length = max_length
+        self.max_candidates = max_candidates
+        self.time_budget = time_budget
+
+    @property
+    def fingerprint(self):
+        """
+        Hash of dictionaries and rules. It is used as the key of analysis cache.
+        """
+
+        if self._fingerprint is None:
+            self._fingerprint = dictionary_fingerprint(
+                self.verbs, self.adjectives, self.eomis, self.lemma_rules, self.jamo_rules)
+        return self._fingerprint
+
+    def _check_dictionary(self, verbs, adjectives, eomis, dictionary_name, dictionary_backend='set'):
         """
         Arguments
         ---------
@@ -73,13 +159,22 @@ class Lemmatizer:
             Dictionary set
             If they are None, use trained dictionary.
             They are passed from __init__ function.
+        dictionary_backend : str
+            'set' or 'compact'
 
         Returns
         -------
-        verbs, adjectives, eomis : set of str
+        verbs, adjectives, eomis : set of str or CompactMorphemeSet
             If each set is None, use trained dictionary with loading function.
         """
 
+        if dictionary_backend == 'set':
+            backend = set
+        elif dictionary_backend == 'compact':
+            backend = CompactMorphemeSet
+        else:
+            raise ValueError("You put wrong dictionary_backend '{}'. Acceptable only ['set', 'compact']".format(dictionary_backend))
+
         morphs_set = [
             # morphs set, name
             (verbs, 'Verbs'),
@@ -92,8 +187,8 @@ class Lemmatizer:
                 morphs = self._load_dictionary(
                     '{}/soylemma/dictionary/{}/{}.txt'.format(
                         installpath, dictionary_name, tag))
-            if not isinstance(morphs, set):
-                morphs = set(morphs)
+            if not isinstance(morphs, backend):
+                morphs = backend(morphs)
             morphs_set_.append(morphs)
 
         verbs, adjectives, eomis = morphs_set_
@@ -147,6 +242,25 @@ class Lemmatizer:
         conjugate_rules = to_conjugate_rules(lemma_rules)
         return lemma_rules, conjugate_rules
 
+    def _check_jamo_rules(self, lemma_rules, dictionary_name, rule_representation):
+        """
+        Returns
+        -------
+        jamo_rules : JamoRules or None
+            Rules loaded from jamo_rules.txt of the dictionary.
+            None if rule_representation is 'syllable', lemma_rules is given,
+            or the dictionary has no jamo_rules.txt.
+        """
+
+        if rule_representation == 'syllable':
+            return None
+        if rule_representation != 'jamo':
+            raise ValueError("You put wrong rule_representation '{}'. Acceptable only ['syllable', 'jamo']".format(rule_representation))
+        path = '{}/soylemma/dictionary/{}/jamo_rules.txt'.format(installpath, dictionary_name)
+        if lemma_rules is not None or not os.path.exists(path):
+            return None
+        return JamoRules.load(path)
+
     def _load_rules(self, path):
         """
         Arguments
@@ -197,6 +311,11 @@ class Lemmatizer:
             self.eomis.update(words)
         else:
             raise ValueError("You put wrong tag '{}'. Acceptable only ['Adjective', 'Verb', 'Eomi']".format(tag))
+        if self._vocabularies is not None:
+            vocabulary = self._vocabularies[1] if tag == EOMI else self._vocabularies[0]
+            for word in sorted(words):
+                vocabulary.intern(word)
+        self._fingerprint = None
 
     def add_lemma_rules(self, rules):
         """
@@ -216,12 +335,79 @@ class Lemmatizer:
         """
 
         rules = check_rules(rules)
-        self.lemma_rules = update_rules(self.lemma_rules, rules)
-
         supplements = to_conjugate_rules(rules)
         self.conjugate_rules = update_rules(self.conjugate_rules, supplements)
 
-    def analyze(self, word, debug=False):
+        if self.jamo_rules is not None:
+            self.jamo_rules.add_rules(rules)
+        elif isinstance(self.rule_automaton, LayeredAutomaton):
+            # compile only the private surfaces, the base automaton is shared
+            self.lemma_rules = update_rules(self.lemma_rules, rules)
+            base = self.lemma_rules.base
+            self.rule_automaton = LayeredAutomaton(self.rule_automaton.base,
+                [surface for surface in self.lemma_rules.overlay if not (surface in base)])
+        else:
+            self.lemma_rules = update_rules(self.lemma_rules, rules)
+            self.rule_automaton = RuleAutomaton(self.lemma_rules)
+        self._fingerprint = None
+
+    def memory_usage(self):
+        """
+        Returns
+        -------
+        report : dict
+            Deep sizes of verbs, adjectives, eomis, lemma_rules, conjugate_rules
+            and precomputed tables, with entry counts and bytes per entry.
+            See `soylemma.memory.memory_usage`
+
+        Usage
+        -----
+            >>> lemmatizer.memory_usage()['verbs']
+            $ {'bytes': 1418136, 'entries': 10753, 'bytes_per_entry': 131.88}
+        """
+
+        return memory_usage(self)
+
+    def overlay(self):
+        """
+        Returns
+        -------
+        lemmatizer : Lemmatizer
+            A new lemmatizer which shares dictionaries and rules of this lemmatizer
+            as read-only base layers.
+
+        `add_words` and `add_lemma_rules` of the returned lemmatizer update only its own
+        overlay layers, so creating it does not copy the base, and memory grows only with
+        the size of the additions. Do not update the base lemmatizer after creating overlays.
+
+        Usage
+        -----
+            >>> base = Lemmatizer(dictionary_name='demo')
+            >>> tenant = base.overlay()
+            >>> tenant.add_words('어여쁘', 'Adjective')
+            >>> tenant.analyze('어여뻤어')
+            $ [(('어여쁘', 'Adjective'), ('었어', 'Eomi'))]
+
+            >>> base.analyze('어여뻤어')
+            $ []
+        """
+
+        lemmatizer = copy.copy(self)
+        lemmatizer.verbs = LayeredMorphemeSet(self.verbs)
+        lemmatizer.adjectives = LayeredMorphemeSet(self.adjectives)
+        lemmatizer.eomis = LayeredMorphemeSet(self.eomis)
+        lemmatizer.conjugate_rules = LayeredRules(self.conjugate_rules)
+        if self.jamo_rules is None:
+            lemmatizer.lemma_rules = LayeredRules(self.lemma_rules)
+            lemmatizer.rule_automaton = LayeredAutomaton(self.rule_automaton)
+        else:
+            lemmatizer.jamo_rules = self.jamo_rules.overlay()
+        lemmatizer._vocabularies = tuple(
+            LayeredVocabulary(vocabulary) for vocabulary in self._get_vocabularies())
+        lemmatizer._fingerprint = None
+        return lemmatizer
+
+    def analyze(self, word, debug=False, return_truncated=False):
         """
         Arguments
         ---------
@@ -229,20 +415,129 @@ class Lemmatizer:
             A word to perform morphological analysis
         debug : Boolean
             If True, verbose on
+        return_truncated : Boolean
+            If True, it also returns whether the analysis exceeded
+            `max_length`, `max_candidates` or `time_budget` and was truncated
 
         Returns
         -------
         morphemes : list of tuple
+        truncated : Boolean
+            Only if return_truncated is True
 
         Usage
         -----
             >>> lemmatizer.analyze('차가우니까')
             $ [(('차갑', 'Adjective'), ('우니까', 'Eomi'))]
+
+            >>> lemmatizer = Lemmatizer(max_length=10)
+            >>> lemmatizer.analyze('파랬다', return_truncated=True)
+            $ ([(('파랗', 'Adjective'), ('았다', 'Eomi'))], False)
+
+            >>> lemmatizer.analyze('하' * 1000 + '했다', return_truncated=True)
+            $ ([], True)
+        """
+
+        morphs, truncated = self._analyze(word, debug)
+        if return_truncated:
+            return morphs, truncated
+        return morphs
+
+    def _rules(self):
+        if self.jamo_rules is None:
+            return self.lemma_rules, self.rule_automaton
+        return self.jamo_rules, None
+
+    def _analyze(self, word, debug=False):
+        rules, automaton = self._rules()
+        if self.max_length is None and self.max_candidates is None and self.time_budget is None:
+            morphs = analyze_morphology(
+                word, self.verbs, self.adjectives,
+                self.eomis, rules, debug, automaton)
+            return morphs, False
+        return analyze_morphology_bounded(
+            word, self.verbs, self.adjectives, self.eomis, rules,
+            self.max_length, self.max_candidates, self.time_budget, automaton, debug)
+
+    def analyze_many(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to perform morphological analysis
+
+        Returns
+        -------
+        morphemes : list of list of tuple
+            Analysis results aligned with input words
+
+        Each distinct word is analyzed once.
+        If cache is set, cached words are read and missed words are written in batch.
+        Truncated analyses are not written to cache.
+
+        Usage
+        -----
+            >>> lemmatizer.analyze_many(['차가우니까', '파랬다'])
+            $ [[(('차갑', 'Adjective'), ('우니까', 'Eomi'))],
+               [(('파랗', 'Adjective'), ('았다', 'Eomi'))]]
+        """
+
+        distinct = set(words)
+        if self.cache is None:
+            results = {}
+        else:
+            results = self.cache.get_many(self.fingerprint, distinct)
+        missed = {word: self._analyze(word) for word in distinct if not (word in results)}
+        if self.cache is not None:
+            self.cache.set_many(self.fingerprint,
+                {word: morphs for word, (morphs, truncated) in missed.items() if not truncated})
+        results.update({word: morphs for word, (morphs, _) in missed.items()})
+        return [results[word] for word in words]
+
+    def analyze_bulk(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to perform morphological analysis
+
+        Returns
+        -------
+        bulk : BulkAnalysis
+            Analysis results as flat integer arrays (CSR-style offsets,
+            stem_ids, eomi_ids and tag_ids) with vocabularies to decode them.
+
+        Stems, eomis and tags are interned to integer ids once per lemmatizer,
+        so ids are stable across calls. Lemmatizers created by `overlay` share the ids
+        of the base, and ids of their own additions follow them.
+
+        Usage
+        -----
+            >>> bulk = lemmatizer.analyze_bulk(['차가우니까', '한국어', '파랬다'])
+            >>> bulk.offsets
+            $ array([0, 1, 1, 2], dtype=int32)
+
+            >>> bulk.stems.decode(bulk.stem_ids)
+            $ ['차갑', '파랗']
         """
 
-        return analyze_morphology(
-            word, self.verbs, self.adjectives,
-            self.eomis, self.lemma_rules, debug)
+        return analyze_bulk(words, self._analyze_ids, self._get_vocabularies())
+
+    def _analyze_ids(self, words):
+        vocabularies = self._vocabularies
+        bounded = not (self.max_length is None and self.max_candidates is None and self.time_budget is None)
+        if self.cache is not None or bounded:
+            return [to_ids(morphs, vocabularies) for morphs in self.analyze_many(words)]
+        # without cache, ids are emitted from the dictionary check
+        rules, automaton = self._rules()
+        return [analyze_morphology_ids(word, self.verbs, self.adjectives, self.eomis,
+                rules, vocabularies, automaton) for word in words]
+
+    def _get_vocabularies(self):
+        if self._vocabularies is None:
+            self._vocabularies = build_vocabularies(
+                self.verbs, self.adjectives, self.eomis)
+        return self._vocabularies
 
     def lemmatize(self, word):
         """
@@ -261,11 +556,27 @@ class Lemmatizer:
             $ [('차갑다', 'Adjective')]
         """
 
-        morphs = analyze_morphology(
-            word, self.verbs, self.adjectives,
-            self.eomis, self.lemma_rules)
-        lemmas = [(stem[0]+'다', stem[1]) for stem, eomi in morphs]
-        return lemmas
+        return to_lemmas(self.analyze(word))
+
+    def lemmatize_many(self, words):
+        """
+        Arguments
+        ---------
+        words : list of str
+            Words to recover canonical form (lemma)
+
+        Returns
+        -------
+        lemmas : list of list of tuple
+            Lemmas aligned with input words
+
+        Usage
+        -----
+            >>> lemmatizer.lemmatize_many(['차가우니까', '파랬다'])
+            $ [[('차갑다', 'Adjective')], [('파랗다', 'Adjective')]]
+        """
+
+        return [to_lemmas(morphs) for morphs in self.analyze_many(words)]
 
     def conjugate(self, stem, eomi):
         """
@@ -286,6 +597,9 @@ class Lemmatizer:
 
         return get_conjugate_candidates(stem, eomi, self.conjugate_rules)
 
+def to_lemmas(morphs):
+    return [(stem[0]+'다', stem[1]) for stem, eomi in morphs]
+
 def to_conjugate_rules(lemma_rules):
     # (하, 았) -> [했]
     conjugate_rules = defaultdict(lambda: set())
@@ -294,7 +608,7 @@ def to_conjugate_rules(lemma_rules):
             conjugate_rules[(stem, eomi)].add(surf)
     return dict(conjugate_rules)
 
-def analyze_morphology(word, verbs, adjectives, eomis, lemma_rules, debug=False):
+def analyze_morphology(word, verbs, adjectives, eomis, lemma_rules, debug=False, automaton=None):
     """
     Arguments
     ---------
@@ -306,10 +620,12 @@ def analyze_morphology(word, verbs, adjectives, eomis, lemma_rules, debug=False)
         Adjective dictionary
     eomis : set of str
         Eomi dictionary
-    lemma_rules : dict of tuple
+    lemma_rules : dict of tuple or JamoRules
         Lemmatization rules
     debug : Boolean
         If True, it prints all candidates
+    automaton : RuleAutomaton or None
+        Automaton over the keys of lemma_rules. See `get_lemma_candidates`
 
     Returns
     -------
@@ -326,7 +642,7 @@ def analyze_morphology(word, verbs, adjectives, eomis, lemma_rules, debug=False)
     """
 
     morphs = set()
-    for stem, eomi in get_lemma_candidates(word, lemma_rules, debug):
+    for stem, eomi in get_lemma_candidates(word, lemma_rules, debug, automaton, (verbs, adjectives, eomis)):
         if not (eomi in eomis):
             continue
         if stem in adjectives:
@@ -335,14 +651,130 @@ def analyze_morphology(word, verbs, adjectives, eomis, lemma_rules, debug=False)
             morphs.add(((stem, VERB), (eomi, EOMI)))
     return list(morphs)
 
-def get_lemma_candidates(word, rules, debug=False):
+def analyze_morphology_ids(word, verbs, adjectives, eomis, lemma_rules, vocabularies, automaton=None):
+    """
+    Arguments
+    ---------
+    word, verbs, adjectives, eomis, lemma_rules, automaton :
+        Same with `analyze_morphology`
+    vocabularies : (Vocabulary, Vocabulary, Vocabulary)
+        Stem, eomi and tag vocabularies. See `soylemma.bulk.build_vocabularies`
+
+    Returns
+    -------
+    stem_ids, eomi_ids, tag_ids : list of int
+        Same analyses with `analyze_morphology`, interned to ids
+        while the candidates are checked.
+    """
+
+    stems_, eomis_, tags_ = vocabularies
+    candidates = iter_lemma_candidates(word, lemma_rules, automaton=automaton,
+        dictionaries=(verbs, adjectives, eomis))
+    analyses = {(stem, eomi, tag) for stem, eomi, tag, _ in
+                check_candidates(candidates, verbs, adjectives, eomis)}
+    stem_ids, eomi_ids, tag_ids = [], [], []
+    for stem, eomi, tag in analyses:
+        stem_ids.append(stems_.intern(stem))
+        eomi_ids.append(eomis_.intern(eomi))
+        tag_ids.append(tags_.intern(tag))
+    return stem_ids, eomi_ids, tag_ids
+
+def analyze_morphology_bounded(word, verbs, adjectives, eomis, lemma_rules,
+    max_length=None, max_candidates=None, time_budget=None, automaton=None, debug=False):
+    """
+    Arguments
+    ---------
+    word, verbs, adjectives, eomis, lemma_rules, automaton, debug :
+        Same with `analyze_morphology`
+    max_length : int or None
+        If the word is longer than max_length, only conjugation points in
+        the trailing `max_length` characters are checked.
+    max_candidates : int or None
+        Maximum number of (stem, eomi) candidates to check
+    time_budget : float or None
+        Maximum seconds to spend
+
+    Returns
+    -------
+    morphs : list of tuple
+        Dictionary checked list of (stem, eomi) found within the limits
+    truncated : Boolean
+        True if any limit was exceeded
+
+    Candidates are generated from the end of the word, so when the analysis is truncated,
+    analyses with shorter eomis have been checked.
+    """
+
+    truncated = False
+    begin = 0
+    if max_length is not None and len(word) > max_length:
+        begin = len(word) - max_length
+        truncated = True
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    candidates = iter_lemma_candidates(word, lemma_rules, begin, True, automaton, (verbs, adjectives, eomis))
+
+    def limited():
+        nonlocal truncated
+        for n, (stem, eomi, rule) in enumerate(candidates):
+            if max_candidates is not None and n >= max_candidates:
+                truncated = True
+                return
+            if deadline is not None and n % 64 == 0 and time.perf_counter() > deadline:
+                truncated = True
+                return
+            if debug and rule is not None:
+                args = (word, stem, eomi) + rule
+                print('[DEBUG] word: {} = {} + {}, conjugation: {} = {} + {}'.format(*args))
+            yield stem, eomi, rule
+
+    morphs = {((stem, tag), (eomi, EOMI)) for stem, eomi, tag, _ in
+              check_candidates(limited(), verbs, adjectives, eomis)}
+    if debug and truncated:
+        print('[DEBUG] word: {}, analysis was truncated'.format(word))
+    return list(morphs), truncated
+
+def check_candidates(candidates, verbs, adjectives, eomis):
+    """
+    Arguments
+    ---------
+    candidates : iterable of (str, str, tuple or None)
+        (stem, eomi, rule) candidates. See `iter_lemma_candidates`
+    verbs, adjectives, eomis : set of str
+        Dictionaries
+
+    Yields
+    ------
+    stem, eomi, tag, rule : str, str, str, tuple or None
+        Candidates whose eomi and stem are known words.
+        A stem in both verbs and adjectives is yielded once with each tag.
+    """
+
+    for stem, eomi, rule in candidates:
+        if not (eomi in eomis):
+            continue
+        if stem in adjectives:
+            yield stem, eomi, ADJECTIVE, rule
+        if stem in verbs:
+            yield stem, eomi, VERB, rule
+
+def get_lemma_candidates(word, rules, debug=False, automaton=None, dictionaries=None):
     """
     Arguments
     ---------
     word : str
         A word to analyze its morphology
-    rules : dict of tuple
+    rules : dict of tuple or JamoRules
         Lemmatization rules
+    debug : Boolean
+        If True, it prints all candidates
+    automaton : RuleAutomaton or None
+        Automaton over the keys of rules.
+        If given, all surfaces in the word are found in one scan, whatever their length.
+        Else, substrings of 1 - 3 syllables at each position are looked up in rules.
+    dictionaries : (set of str, set of str, set of str) or None
+        Verb, adjective and eomi dictionaries. If rules is JamoRules, candidates of
+        jamo patterns are generated only when their stem and eomi are known.
 
     Returns
     -------
@@ -377,33 +809,89 @@ def get_lemma_candidates(word, rules, debug=False):
         $ [DEBUG] word: 파랬다 = 파랗 + 았다, conjugation: 랬 = 랗 + 았
     """
 
-    def debug_on(word, l, stem, eomi, r, conj):
-        args = (word, l+stem, eomi+r, conj, stem, eomi)
-        print('[DEBUG] word: {} = {} + {}, conjugation: {} = {} + {}'.format(*args))
-
-    max_i = len(word) - 1
     candidates = []
-    for i, c in enumerate(word):
-        l = word[:i+1]
-        r = word[i+1:]
+    for stem, eomi, rule in iter_lemma_candidates(word, rules, automaton=automaton, dictionaries=dictionaries):
+        candidates.append((stem, eomi))
+        if debug and rule is not None:
+            args = (word, stem, eomi) + rule
+            print('[DEBUG] word: {} = {} + {}, conjugation: {} = {} + {}'.format(*args))
+    return candidates
+
+def iter_lemma_candidates(word, rules, begin=0, reverse=False, automaton=None, dictionaries=None):
+    """
+    Arguments
+    ---------
+    word : str
+        A word to analyze its morphology
+    rules : dict of tuple or JamoRules
+        Lemmatization rules
+    begin : int
+        The first position checked as conjugation point
+    reverse : Boolean
+        If True, positions are checked from the end of the word
+    automaton : RuleAutomaton or None
+        Automaton over the keys of rules. See `get_lemma_candidates`
+    dictionaries : (set of str, set of str, set of str) or None
+        Verb, adjective and eomi dictionaries. See `get_lemma_candidates`
+
+    Yields
+    ------
+    stem, eomi, rule : str, str, tuple or None
+        Candidate (stem, eomi) and the rule which generates it.
+        rule is (surface, canonical stem, canonical eomi),
+        or None if the word is split without conjugation.
+    """
+
+    # In reverse order, nothing is scanned ahead of the current position,
+    # so a caller can stop at any time, even in a very long word.
+    # In forward order, the word is scanned once from `begin`.
+    jamo_rules = None
+    if isinstance(rules, JamoRules):
+        stems, eomis = (None, None) if dictionaries is None else (dictionaries[:2], dictionaries[2])
+        jamo_rules, rules, automaton = rules, rules.rules, rules.automaton
+        if not reverse:
+            # {position:candidates} of jamo patterns
+            conjugations = jamo_rules.find_conjugations(word, begin, eomis, stems)
+
+    # {begin position:surfaces}
+    if automaton is not None and not reverse:
+        matches = {}
+        for b, surface in automaton.iter_matches(word, begin):
+            matches.setdefault(b, []).append(surface)
+
+    n = len(word)
+    max_i = n - 1
+    positions = range(begin, n)
+    if reverse:
+        positions = reversed(positions)
+    for i in positions:
         l_ = word[:i]
         if i < max_i:
-            candidates.append((l, r))
-
-        # 1 syllable conjugation
-        for stem, eomi in rules.get(c, {}):
-            for stem, eomi in rules.get(c, {}):
-                candidates.append((l_ + stem, eomi + r))
-                if debug:
-                    debug_on(word, l_, stem, eomi, r, c)
-
-        # 2 or 3 syllables conjugation
-        for conj in {word[i:i+2], word[i:i+3]}:
-            for stem, eomi in rules.get(conj, {}):
-                candidates.append((l_ + stem, eomi + r[1:]))
-                if debug:
-                    debug_on(word, l_, stem, eomi, r[1:], conj)
-    return candidates
+            yield word[:i+1], word[i+1:], None
+
+        if automaton is None:
+            # 1, 2 or 3 syllables conjugation
+            surfaces = {word[i:i+1], word[i:i+2], word[i:i+3]}
+        elif reverse:
+            # surfaces of any length in the automaton
+            surfaces = [word[i:e] for e in range(i + 1, min(n, i + automaton.max_length) + 1)]
+        else:
+            surfaces = matches.get(i, ())
+
+        # surface is replaced by stem + eomi. As the trained rules expect, the word
+        # after the second syllable of a 2 or 3 syllables surface follows the eomi.
+        # A surface longer than 3 syllables is replaced as a whole.
+        for surface in surfaces:
+            length = len(surface)
+            r = word[i+(2 if 2 <= length <= 3 else length):]
+            for stem, eomi in rules.get(surface, ()):
+                yield l_ + stem, eomi + r, (surface, stem, eomi)
+
+        if jamo_rules is not None:
+            if reverse:
+                conjugations = jamo_rules.find_conjugations(word, i, eomis, stems, i + 1)
+            for stem, eomi, rule, _ in conjugations.get(i, ()):
+                yield stem, eomi, rule
 
 def get_conjugate_candidates(stem, eomi, rules):
     stem_ = stem[:-1]
@@ -438,7 +926,8 @@ def check_rules(rules):
 
 def update_rules(base, supplement):
     for surface, supple_set in supplement.items():
-        base_set = base.get(surface, set())
+        # copy, because base may share the set with other (layered) lemmatizers
+        base_set = set(base.get(surface, set()))
         base_set.update(supple_set)
         base[surface] = base_set
     return base
@@ -0,0 +1,190 @@
+from array import array
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+_skip_types = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, type(threading.local()))
+
+def deep_sizeof(obj, seen=None):
+    """
+    Arguments
+    ---------
+    obj : object
+        Object to measure
+    seen : set of int or None
+        Ids of objects already counted. Objects in `seen` are not counted again,
+        so sharing one `seen` over several calls avoids double counting.
+
+    Returns
+    -------
+    size : int
+        Bytes of the object and all objects reachable through containers,
+        instance attributes and slots
+    """
+
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _skip_types):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, array, int, float)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+        for slot in getattr(type(obj), '__slots__', ()):
+            if hasattr(obj, slot):
+                stack.append(getattr(obj, slot))
+    return size
+
+def _count_entries(name, obj):
+    if obj is None:
+        return 0
+    if name in ('lemma_rules', 'conjugate_rules'):
+        return sum(len(values) for values in obj.values())
+    if name == 'vocabularies':
+        return sum(len(vocab) for vocab in obj)
+    return len(obj)
+
+def memory_usage(lemmatizer):
+    """
+    Arguments
+    ---------
+    lemmatizer : Lemmatizer
+
+    Returns
+    -------
+    report : dict
+        {component:{'bytes':int, 'entries':int, 'bytes_per_entry':float}}
+        and 'total' bytes.
+
+    Components are measured in order with shared bookkeeping, so an object shared by
+    several components (for example, a stem str in both verbs and lemma_rules) is
+    counted once, in the first component. Dictionaries of a lemmatizer created by
+    `overlay` include their shared base layers.
+    Persistent cache (AnalysisCache) is reported with its on-disk size.
+
+    Usage
+    -----
+        >>> lemmatizer.memory_usage()
+        $ {'verbs': {'bytes': 1418136, 'entries': 10753, 'bytes_per_entry': 131.88},
+           ...
+           'total': 7520123}
+    """
+
+    components = [
+        ('verbs', lemmatizer.verbs),
+        ('adjectives', lemmatizer.adjectives),
+        ('eomis', lemmatizer.eomis),
+        ('lemma_rules', lemmatizer.lemma_rules),
+        ('conjugate_rules', lemmatizer.conjugate_rules),
+        ('rule_automaton', getattr(lemmatizer, 'rule_automaton', None)),
+        ('jamo_rules', getattr(lemmatizer, 'jamo_rules', None)),
+        ('vocabularies', getattr(lemmatizer, '_vocabularies', None)),
+    ]
+    seen = set()
+    report = {}
+    total = 0
+    for name, obj in components:
+        size = 0 if obj is None else deep_sizeof(obj, seen)
+        entries = _count_entries(name, obj)
+        report[name] = {
+            'bytes': size,
+            'entries': entries,
+            'bytes_per_entry': size / entries if entries else 0.0
+        }
+        total += size
+
+    cache = getattr(lemmatizer, 'cache', None)
+    if cache is not None:
+        report['cache'] = {
+            'disk_bytes': sum(os.path.getsize(path) for path in
+                [cache.path, cache.path + '-wal'] if os.path.exists(path)),
+            'entries': len(cache)
+        }
+    report['total'] = total
+    return report
+
+def peak_rss():
+    """
+    Returns
+    -------
+    bytes : int or None
+        Peak resident set size of this process. None if `resource` is not available.
+    """
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def measure_loading(**kwargs):
+    """
+    Arguments
+    ---------
+    kwargs : Lemmatizer arguments
+
+    Returns
+    -------
+    lemmatizer : Lemmatizer
+        Loaded lemmatizer
+    report : dict
+        'seconds' : loading time
+        'peak_traced_bytes' : peak of Python allocations during loading (tracemalloc)
+        'peak_rss_bytes' : peak RSS of this process after loading
+        'peak_rss_increase_bytes' : increase of peak RSS by loading
+
+    Peak RSS is the peak of the whole process lifetime. Run it in a fresh process
+    to compare dictionary backends or retrained dictionaries.
+
+    Usage
+    -----
+        >>> lemmatizer, report = measure_loading(dictionary_backend='compact')
+    """
+
+    from .lemmatizer import Lemmatizer
+
+    rss_before = peak_rss()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    begin = time.perf_counter()
+
+    lemmatizer = Lemmatizer(**kwargs)
+
+    seconds = time.perf_counter() - begin
+    traced_peak = tracemalloc.get_traced_memory()[1] - traced_before
+    if not tracing:
+        tracemalloc.stop()
+    rss_after = peak_rss()
+
+    report = {
+        'seconds': seconds,
+        'peak_traced_bytes': traced_peak,
+        'peak_rss_bytes': rss_after,
+        'peak_rss_increase_bytes': None if rss_after is None else rss_after - rss_before
+    }
+    return lemmatizer, report
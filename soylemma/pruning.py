@@ -0,0 +1,310 @@
+from collections import defaultdict
+import os
+import time
+from .jamo import JamoRules
+from .jamo import fit_jamo_rules
+from .lemmatizer import Lemmatizer
+from .lemmatizer import check_candidates
+from .lemmatizer import iter_lemma_candidates
+from .memory import memory_usage
+from .utils import installpath
+from .utils import VERB, ADJECTIVE, EOMI
+
+
+class Profile:
+    """
+    Usage statistics of dictionaries and rules collected from a corpus
+
+    Attributes
+    ----------
+    verbs, adjectives, eomis : {str:int}
+        {morpheme:weight of words whose accepted analyses use the morpheme}
+    rules : {tuple:int}
+        {(surface, stem, eomi):weight of words whose accepted analyses use the rule}
+    n_words : int
+        Total weight of profiled words
+    n_analyzed : int
+        Total weight of words which have at least one analysis
+    n_candidates : int
+        Total number of (stem, eomi) candidates, weighted by word count
+    """
+
+    def __init__(self):
+        self.verbs = defaultdict(int)
+        self.adjectives = defaultdict(int)
+        self.eomis = defaultdict(int)
+        self.rules = defaultdict(int)
+        self.n_words = 0
+        self.n_analyzed = 0
+        self.n_candidates = 0
+
+def profile(lemmatizer, word_counts):
+    """
+    Arguments
+    ---------
+    lemmatizer : Lemmatizer
+        Lemmatizer to be profiled
+    word_counts : {str:int}
+        Representative corpus. {word:count}
+
+    Returns
+    -------
+    profile : Profile
+        Which rules and dictionary entries produce accepted analyses
+
+    Rules are profiled at syllable level (`lemma_rules`), so the lemmatizer must
+    apply syllable-level rules. Jamo rules of the pruned rules are fitted again
+    by `fit_pruned_jamo_rules`.
+
+    Usage
+    -----
+        >>> word_counts = load_word_counts('corpus.txt')
+        >>> prof = profile(Lemmatizer(), word_counts)
+        >>> prof.rules[('했', '하', '았')]
+        $ 1532
+    """
+
+    if lemmatizer.lemma_rules is None:
+        raise ValueError("Profile a lemmatizer with rule_representation='syllable'")
+
+    prof = Profile()
+    verbs, adjectives, eomis = lemmatizer.verbs, lemmatizer.adjectives, lemmatizer.eomis
+    for word, count in word_counts.items():
+        # each entry is counted once per word
+        used = set()
+        candidates = list(iter_lemma_candidates(word, lemmatizer.lemma_rules,
+            automaton=lemmatizer.rule_automaton))
+        for stem, eomi, tag, rule in check_candidates(candidates, verbs, adjectives, eomis):
+            used.add((tag, stem))
+            used.add((EOMI, eomi))
+            if rule is not None:
+                used.add(('Rule', rule))
+        prof.n_words += count
+        prof.n_candidates += len(candidates) * count
+        if used:
+            prof.n_analyzed += count
+        for tag, entry in used:
+            _counter(prof, tag)[entry] += count
+    return prof
+
+def _counter(prof, tag):
+    if tag == VERB:
+        return prof.verbs
+    if tag == ADJECTIVE:
+        return prof.adjectives
+    if tag == EOMI:
+        return prof.eomis
+    return prof.rules
+
+def prune(lemmatizer, prof, max_loss=0.01, counts=None):
+    """
+    Arguments
+    ---------
+    lemmatizer : Lemmatizer
+        Profiled lemmatizer
+    prof : Profile
+        Return value of `profile`
+    max_loss : float
+        Accuracy-loss budget, the fraction of profiled words (weighted by count)
+        allowed to change their analysis.
+    counts : ({str:int}, {str:int}, {str:int}) or None
+        Training counts of verbs, adjectives and eomis. See `load_dictionary_counts`.
+        If None, or a morpheme has no training count, its usage in the profile is used.
+
+    Returns
+    -------
+    verbs, adjectives, eomis : {str:int}
+        Slimmed dictionaries. {morpheme:count}
+        Counts are the training counts, so `min_count` keeps its meaning.
+    rules : dict of set
+        Slimmed lemmatization rules
+
+    Entries never used by accepted analyses are always removed.
+    Then the least used entries are removed while the sum of their usage stays in budget.
+    A word changes its analysis only if some removed entry was used by the word,
+    so the sum of usage is an upper bound of the accuracy loss on the profiled corpus.
+
+    The budget holds only on the profiled corpus. Entries which other words need
+    but the corpus never uses are removed, so the loss on unseen words can be much
+    larger than max_loss. Measure it with `evaluate` on a held-out corpus.
+    """
+
+    budget = max_loss * prof.n_words
+    used = [(count, tag, entry) for tag, counter in [
+        (VERB, prof.verbs), (ADJECTIVE, prof.adjectives),
+        (EOMI, prof.eomis), ('Rule', prof.rules)]
+        for entry, count in counter.items()]
+
+    removed = set()
+    loss = 0
+    for count, tag, entry in sorted(used, key=lambda x: (x[0], x[1], x[2])):
+        if loss + count > budget:
+            break
+        loss += count
+        removed.add((tag, entry))
+
+    if counts is None:
+        counts = ({}, {}, {})
+
+    def select(morphs, tag, counter, counts_):
+        return {morph: counts_.get(morph, counter[morph]) for morph in morphs
+                if counter.get(morph, 0) > 0 and not ((tag, morph) in removed)}
+
+    verbs = select(lemmatizer.verbs, VERB, prof.verbs, counts[0])
+    adjectives = select(lemmatizer.adjectives, ADJECTIVE, prof.adjectives, counts[1])
+    eomis = select(lemmatizer.eomis, EOMI, prof.eomis, counts[2])
+
+    rules = defaultdict(lambda: set())
+    for surface, canons in lemmatizer.lemma_rules.items():
+        for stem, eomi in canons:
+            rule = (surface, stem, eomi)
+            if prof.rules.get(rule, 0) > 0 and not (('Rule', rule) in removed):
+                rules[surface].add((stem, eomi))
+    return verbs, adjectives, eomis, dict(rules)
+
+def evaluate(base, pruned, word_counts):
+    """
+    Arguments
+    ---------
+    base : Lemmatizer
+        Lemmatizer before pruning
+    pruned : Lemmatizer
+        Lemmatizer after pruning
+    word_counts : {str:int}
+        Evaluation corpus. {word:count}
+
+    Returns
+    -------
+    report : dict
+        Accuracy loss, candidates per word, memory and throughput of both lemmatizers.
+        memory_bytes is the total of `soylemma.memory.memory_usage`
+    """
+
+    n_words = sum(word_counts.values())
+    n_changed = 0
+    for word, count in word_counts.items():
+        if set(base.analyze(word)) != set(pruned.analyze(word)):
+            n_changed += count
+
+    report = {'accuracy_loss': n_changed / max(1, n_words)}
+    for name, lemmatizer in [('base', base), ('pruned', pruned)]:
+        rules, automaton = lemmatizer._rules()
+        dictionaries = (lemmatizer.verbs, lemmatizer.adjectives, lemmatizer.eomis)
+        n_candidates = sum(len(list(iter_lemma_candidates(word, rules, automaton=automaton,
+            dictionaries=dictionaries))) * count for word, count in word_counts.items())
+        begin = time.perf_counter()
+        for word in word_counts:
+            lemmatizer.analyze(word)
+        elapsed = max(time.perf_counter() - begin, 1e-9)
+        report[name] = {
+            'n_verbs': len(lemmatizer.verbs),
+            'n_adjectives': len(lemmatizer.adjectives),
+            'n_eomis': len(lemmatizer.eomis),
+            'n_rules': len(rules) if isinstance(rules, JamoRules) else sum(len(canons) for canons in rules.values()),
+            'candidates_per_word': n_candidates / max(1, n_words),
+            'memory_bytes': memory_usage(lemmatizer)['total'],
+            'words_per_sec': len(word_counts) / elapsed
+        }
+    return report
+
+def load_word_counts(path):
+    """
+    Arguments
+    ---------
+    path : str
+        Corpus file path. Words are separated by white space.
+
+    Returns
+    -------
+    word_counts : {str:int}
+        {word:count}
+    """
+
+    word_counts = defaultdict(int)
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            for word in line.split():
+                word_counts[word] += 1
+    return dict(word_counts)
+
+def load_dictionary_counts(dictionary_name='default'):
+    """
+    Arguments
+    ---------
+    dictionary_name : str
+        Dictionary name
+
+    Returns
+    -------
+    verbs, adjectives, eomis : {str:int}
+        {morpheme:training count} of the dictionary files.
+        A morpheme without count column has count 0.
+    """
+
+    counts = []
+    for name in ['Verbs', 'Adjectives', 'Eomis']:
+        path = '{}/soylemma/dictionary/{}/{}.txt'.format(installpath, dictionary_name, name)
+        counts_ = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                cols = line.split()
+                if cols:
+                    counts_[cols[0]] = int(cols[1]) if len(cols) > 1 else 0
+        counts.append(counts_)
+    return tuple(counts)
+
+def fit_pruned_jamo_rules(verbs, adjectives, eomis, rules, word_counts):
+    """
+    Arguments
+    ---------
+    verbs, adjectives, eomis : {str:int}
+        Slimmed dictionaries
+    rules : dict of set
+        Slimmed lemmatization rules
+    word_counts : {str:int}
+        Profiled corpus
+
+    Returns
+    -------
+    jamo_rules : JamoRules
+        Jamo rules of the slimmed rules, exact on the words of the profiled corpus.
+        See `soylemma.jamo.fit_jamo_rules`
+    """
+
+    return fit_jamo_rules(rules, word_counts, set(verbs), set(adjectives), set(eomis))
+
+def save_dictionary(directory, verbs, adjectives, eomis, rules, jamo_rules=None):
+    """
+    Arguments
+    ---------
+    directory : str
+        Dictionary directory. Four files are written in the directory
+    verbs, adjectives, eomis : {str:int}
+        {morpheme:count}
+    rules : dict of set
+        Lemmatization rules
+    jamo_rules : JamoRules or None
+        If given, it is written as jamo_rules.txt. See `fit_pruned_jamo_rules`.
+        Else, an existing jamo_rules.txt is removed, because it was fitted to other rules
+        and `rule_representation='jamo'` must not load it.
+    """
+
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    for dic, name in [(adjectives, 'Adjectives'), (verbs, 'Verbs'), (eomis, 'Eomis')]:
+        with open('{}/{}.txt'.format(directory, name), 'w', encoding='utf-8') as f:
+            for morpheme, count in sorted(dic.items()):
+                f.write('{} {}\n'.format(morpheme, count))
+    with open('{}/rules.txt'.format(directory), 'w', encoding='utf-8') as f:
+        for surface, canons in sorted(rules.items()):
+            for l, r in sorted(canons):
+                f.write('{} {} {}\n'.format(surface, l, r))
+    jamo_path = '{}/jamo_rules.txt'.format(directory)
+    if jamo_rules is not None:
+        jamo_rules.save(jamo_path)
+    elif os.path.exists(jamo_path):
+        os.remove(jamo_path)
+
+def pruned_lemmatizer(verbs, adjectives, eomis, rules):
+    return Lemmatizer(verbs=set(verbs), adjectives=set(adjectives),
+        eomis=set(eomis), lemma_rules={s: set(c) for s, c in rules.items()})
@@ -0,0 +1,123 @@
+from heapq import heappop, heappush
+import random
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving heavy hitter counter with fixed memory
+
+    Arguments
+    ---------
+    capacity : int
+        Maximum number of monitored items
+
+    Let N be the total weight added. Then
+    - Every item whose true count is larger than N / capacity is monitored.
+    - For a monitored item, count - error <= true count <= count,
+      and error <= N / capacity.
+
+    Usage
+    -----
+        >>> counter = SpaceSaving(capacity=2)
+        >>> for item in ['가', '가', '나', '다', '가']:
+        >>>     counter.add(item)
+        >>> counter.items()
+        $ {'가': 3, '다': 2}
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # number of monitored items replaced by new items
+        self.n_replaced = 0
+        # one (count, item) entry per monitored item.
+        # counts only increase, so an entry can be stale (smaller than current count).
+        self._heap = []
+
+    def add(self, item, weight=1):
+        self.total += weight
+        counts = self.counts
+        if item in counts:
+            counts[item] += weight
+        elif len(counts) < self.capacity:
+            counts[item] = weight
+            self.errors[item] = 0
+            heappush(self._heap, (weight, item))
+        else:
+            min_count, min_item = self._pop_min()
+            self.n_replaced += 1
+            del counts[min_item]
+            del self.errors[min_item]
+            counts[item] = min_count + weight
+            self.errors[item] = min_count
+            heappush(self._heap, (min_count + weight, item))
+
+    def _pop_min(self):
+        heap, counts = self._heap, self.counts
+        while True:
+            count, item = heappop(heap)
+            current = counts[item]
+            if current == count:
+                return count, item
+            heappush(heap, (current, item))
+
+    @property
+    def error_bound(self):
+        """
+        Maximum overestimation of any count, N / capacity
+        """
+
+        return self.total / self.capacity
+
+    def items(self, guaranteed=False):
+        """
+        Arguments
+        ---------
+        guaranteed : Boolean
+            If True, it returns lower bounds (count - error) instead of estimated counts
+
+        Returns
+        -------
+        counts : {item:int}
+        """
+
+        if guaranteed:
+            return {item: count - self.errors[item] for item, count in self.counts.items()}
+        return dict(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+class Reservoir:
+    """
+    Uniform random sample of a stream with fixed size
+
+    Arguments
+    ---------
+    capacity : int
+        Maximum number of sampled items
+    seed : int or None
+        Random seed
+    """
+
+    def __init__(self, capacity, seed=None):
+        self.capacity = capacity
+        self.items = []
+        self.n_seen = 0
+        self._random = random.Random(seed)
+
+    def add(self, item):
+        self.n_seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+        else:
+            i = self._random.randrange(self.n_seen)
+            if i < self.capacity:
+                self.items[i] = item
+
+    def __len__(self):
+        return len(self.items)
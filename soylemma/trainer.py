@@ -314,3 +314,132 @@ def train_model_using_sejong_corpus_cleaner(local_repository_path, table_path, s
     print('Found {} rules, {} adjectives, {} verbs, {} eomis, with {} ({} %) exceptions'.format(*args))
 
     return adjectives, verbs, eomis, rules, exceptions, lemmatizing_count
+
+def iter_count_table(path):
+    """
+    Arguments
+    ---------
+    path : str
+        Eojeol, Morpheme, Count table. Same format with `load_word_morpheme_table`
+
+    Yields
+    ------
+    (eojeol, morphtags), count : (str, list), int
+        Rows are read one by one, so memory does not grow with the table size.
+    """
+
+    with open(path, encoding='utf-8') as f:
+        next(f)
+        for line in f:
+            eojeol, morphtags, count = parse(line)
+            yield (eojeol, morphtags), count
+
+def train_model_bounded_memory(rows, capacity=100000, rule_capacity=50000,
+    exception_capacity=10000, min_rule_count=1, show_exception=False, seed=None):
+    """
+    Arguments
+    ---------
+    rows : iterable of ((Eojeol, MorphTags), count)
+        For example, `iter_count_table(table_path)`
+    capacity : int
+        Maximum number of monitored morphemes of each tag (adjectives, verbs, eomis)
+    rule_capacity : int
+        Maximum number of monitored (surface, canon) rules
+    exception_capacity : int
+        Size of exception sample
+    min_rule_count : int
+        Minimum guaranteed count (count - error) of returned rules
+    show_exception : Boolean
+        If True, it shows exception when it occurs
+    seed : int or None
+        Random seed of exception sampling
+
+    Returns
+    -------
+    Same with `train_model_using_sejong_corpus_cleaner`.
+    adjectives, verbs, eomis are estimated counts, and exceptions is a uniform sample.
+
+    Memory is fixed by the capacities regardless of the corpus size.
+    Morphemes and rules are counted with weighted Space-Saving counters.
+    Let N be the total count of lemmatizing cases (lemmatizing_count). Then
+
+    - every morpheme whose true count is larger than N / capacity is kept, and
+    - each estimated count c' of a true count c satisfies c <= c' <= c + N / capacity.
+
+    So pruning with `min_count` (update_model.py) keeps every morpheme with c >= min_count
+    when min_count > N / capacity, and a kept morpheme has c >= min_count - N / capacity.
+    The bound of each dictionary is printed after training.
+
+    Rules are counted in the same way with rule_capacity, and a rule is returned only
+    when its guaranteed count is at least min_rule_count. So every returned rule is
+    observed at least min_rule_count times, and every rule observed at least
+    min_rule_count + N / rule_capacity times is returned. Less frequent rules may be
+    dropped when more than rule_capacity rules are found, and it is printed
+    with the number of replaced rules.
+
+    Usage
+    -----
+        >>> rows = iter_count_table('counter_type3_pair_all.txt')
+        >>> parameters = train_model_bounded_memory(rows, capacity=100000)
+        >>> adjectives, verbs, eomis, rules, exceptions, lemmatizing_count = parameters
+    """
+
+    from .sketch import Reservoir
+    from .sketch import SpaceSaving
+
+    eomis = SpaceSaving(capacity)
+    adjectives = SpaceSaving(capacity)
+    verbs = SpaceSaving(capacity)
+    rules = SpaceSaving(rule_capacity)
+    exceptions = Reservoir(exception_capacity, seed)
+
+    lemmatizing_count = 0
+    exception_count = 0
+
+    for (eojeol, morphtags), count in rows:
+        if len(morphtags) != 2:
+            continue
+        (lw, lt), (rw, rt) = morphtags
+        if not is_right_root(lw) or not is_right_eomi(rw):
+            continue
+        lemmatizing_count += count
+
+        try:
+            rule = extract_rule(eojeol, lw, lt, rw, rt)
+            if rule is None:
+                continue
+            rules.add(rule, count)
+            if lt == 'Verb':
+                verbs.add(lw, count)
+            elif lt == 'Adjective':
+                adjectives.add(lw, count)
+            if rt == 'Eomi':
+                eomis.add(rw, count)
+        except Exception as e:
+            if show_exception:
+                print(e)
+            exception_count += count
+            exceptions.add(((eojeol, lw, lt, rw, rt), count))
+
+    rules_ = defaultdict(lambda: set())
+    for (surface, canon), count in rules.items(guaranteed=True).items():
+        if count >= min_rule_count:
+            rules_[surface].add(canon)
+    rules_ = dict(rules_)
+
+    exceptions_ = defaultdict(int)
+    for exception, count in exceptions.items:
+        exceptions_[exception] += count
+    exceptions_ = dict(exceptions_)
+
+    exception_perc = 100 * exception_count / max(1, lemmatizing_count)
+    args = (sum(len(v) for v in rules_.values()), len(adjectives), len(verbs), len(eomis), exceptions.n_seen, '%.3f' % exception_perc)
+    print('Found {} rules, {} adjectives, {} verbs, {} eomis, with {} ({} %) exceptions'.format(*args))
+    args = ('%.3f' % adjectives.error_bound, '%.3f' % verbs.error_bound, '%.3f' % eomis.error_bound, '%.3f' % rules.error_bound)
+    print('Maximum count overestimation: adjectives {}, verbs {}, eomis {}, rules {}'.format(*args))
+    if rules.n_replaced > 0:
+        args = (rules.n_replaced, '%.3f' % (min_rule_count + rules.error_bound))
+        print('{} monitored rules were replaced. Rules observed less than {} times may be missing. '\
+              'Increase rule_capacity to keep them'.format(*args))
+
+    return adjectives.items(), verbs.items(), eomis.items(), rules_, exceptions_, lemmatizing_count
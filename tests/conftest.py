@@ -0,0 +1,28 @@
+import pytest
+from soylemma import Lemmatizer
+
+
+# eojeols with 1, 2 and 3 syllables conjugations, irregular conjugations and no analysis
+WORDS = [
+    '차가우니까', '파랬다', '파랬던', '시작했으니까', '추운데', '시작했다', '한국어',
+    '먹었다', '갔다', '하였다', '해치우고', '만들기이고', '가자고', '구우면서',
+    '나타내기에', '부르면', '이뻤다', '예뻤어', '들었다', '도와주었다', '돌아가셨다',
+    '아름다웠던', '흘렀다', '지었다', '그랬어', '했다', '하', '했', '', '가나다라마바사',
+]
+
+def pytest_generate_tests(metafunc):
+    # a test with `word` argument runs once for each of WORDS
+    if 'word' in metafunc.fixturenames:
+        metafunc.parametrize('word', WORDS)
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+@pytest.fixture(scope='session')
+def lemmatizer():
+    return Lemmatizer()
+
+@pytest.fixture(scope='session')
+def jamo_lemmatizer():
+    return Lemmatizer(rule_representation='jamo')
@@ -0,0 +1,89 @@
+import asyncio
+import time
+import pytest
+from soylemma.aio import AsyncLemmatizer
+
+
+class _Recorder:
+    # records batch sizes, and fails a batch which has 'boom'
+    def __init__(self, lemmatizer):
+        self.lemmatizer = lemmatizer
+        self.batch_sizes = []
+
+    def analyze_many(self, words):
+        self.batch_sizes.append(len(words))
+        if 'boom' in words:
+            raise RuntimeError('boom')
+        return self.lemmatizer.analyze_many(words)
+
+def test_analyze_many_same_with_lemmatizer(lemmatizer, words):
+    recorder = _Recorder(lemmatizer)
+
+    async def run():
+        async with AsyncLemmatizer(recorder, batch_size=4, max_pending=2) as async_lemmatizer:
+            return (await async_lemmatizer.analyze_many(words),
+                    await async_lemmatizer.lemmatize_many(words))
+
+    morphs, lemmas = asyncio.run(run())
+    assert morphs == lemmatizer.analyze_many(words)
+    assert lemmas == lemmatizer.lemmatize_many(words)
+    assert max(recorder.batch_sizes) <= 4
+
+def test_stream_splits_long_text(lemmatizer, words):
+    recorder = _Recorder(lemmatizer)
+    texts = [' '.join(words * 20), '', '파랬다 차가우니까', ' '.join(words * 3)]
+
+    async def run():
+        async with AsyncLemmatizer(recorder, batch_size=16, max_pending=2) as async_lemmatizer:
+            return [item async for item in async_lemmatizer.analyze_stream(texts)]
+
+    results = asyncio.run(run())
+    assert [text for text, _ in results] == texts
+    for text, morphs in results:
+        assert morphs == lemmatizer.analyze_many(text.split())
+    assert max(recorder.batch_sizes) <= 16
+
+def test_failed_batch_settles_others(lemmatizer):
+    recorder = _Recorder(lemmatizer)
+
+    async def run():
+        async with AsyncLemmatizer(recorder, batch_size=4, max_pending=4) as async_lemmatizer:
+            with pytest.raises(RuntimeError):
+                await async_lemmatizer.analyze_many(['파랬다'] * 8 + ['boom'] + ['파랬다'] * 8)
+            # the executor is still usable
+            return await async_lemmatizer.analyze_many(['파랬다'])
+
+    assert asyncio.run(run()) == [lemmatizer.analyze('파랬다')]
+
+def test_wrong_arguments(lemmatizer):
+    with pytest.raises(ValueError):
+        AsyncLemmatizer(lemmatizer, batch_size=0)
+    with pytest.raises(ValueError):
+        AsyncLemmatizer(lemmatizer, executor='fiber')
+
+def test_aclose_does_not_block_loop(lemmatizer):
+    class Slow:
+        def analyze_many(self, words):
+            time.sleep(0.3)
+            return lemmatizer.analyze_many(words)
+
+    async def run():
+        ticks = []
+        async def tick():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        async_lemmatizer = AsyncLemmatizer(Slow())
+        # the batch is still running in the executor when it is closed
+        future = async_lemmatizer._submit(['파랬다'])
+        await asyncio.sleep(0.05)
+        await async_lemmatizer.aclose()
+        await asyncio.sleep(0.05)
+        ticker.cancel()
+        await future
+        return max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    # the loop kept running while the executor waited for the batch
+    assert asyncio.run(run()) < 0.2
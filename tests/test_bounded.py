@@ -0,0 +1,47 @@
+import copy
+import time
+from soylemma import Lemmatizer
+
+
+def test_not_truncated_within_limits():
+    lemmatizer = Lemmatizer(max_length=10, max_candidates=1000, time_budget=1.0)
+    assert lemmatizer.analyze('파랬다', return_truncated=True) == (
+        [(('파랗', 'Adjective'), ('았다', 'Eomi'))], False)
+
+def test_bounded_same_without_limits(lemmatizer, words):
+    bounded = copy.copy(lemmatizer)
+    bounded.max_candidates = 10 ** 9
+    for word in words:
+        assert sorted(bounded.analyze(word)) == sorted(lemmatizer.analyze(word))
+
+def test_truncated_by_max_length():
+    lemmatizer = Lemmatizer(max_length=3)
+    morphs, truncated = lemmatizer.analyze('시작했다', return_truncated=True)
+    assert truncated
+    # conjugation points in the trailing window are still checked,
+    # and the stem spans the whole prefix
+    assert (('시작하', 'Verb'), ('았다', 'Eomi')) in morphs
+
+def test_truncated_by_max_candidates():
+    lemmatizer = Lemmatizer(max_candidates=1)
+    assert lemmatizer.analyze('파랬다', return_truncated=True)[1]
+    assert not Lemmatizer(max_candidates=1000).analyze('파랬다', return_truncated=True)[1]
+
+def test_truncated_by_time_budget():
+    lemmatizer = Lemmatizer(time_budget=0.001)
+    begin = time.perf_counter()
+    morphs, truncated = lemmatizer.analyze('가' * 100000, return_truncated=True)
+    assert truncated
+    assert time.perf_counter() - begin < 0.1
+
+def test_truncated_analysis_is_not_cached(tmp_path):
+    lemmatizer = Lemmatizer(max_length=5, cache=str(tmp_path / 'cache.db'))
+    lemmatizer.analyze_many(['하' * 10 + '했다', '파랬다'])
+    assert len(lemmatizer.cache) == 1
+
+def test_debug_with_limits(capsys):
+    lemmatizer = Lemmatizer(max_length=5)
+    lemmatizer.analyze('파랬다', debug=True)
+    assert '[DEBUG] word: 파랬다 = 파랗 + 았다' in capsys.readouterr().out
+    lemmatizer.analyze('하' * 10 + '했다', debug=True)
+    assert 'truncated' in capsys.readouterr().out
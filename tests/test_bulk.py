@@ -0,0 +1,50 @@
+from soylemma import Lemmatizer
+from soylemma.bulk import LayeredVocabulary
+from soylemma.bulk import Vocabulary
+
+
+def test_analyze_bulk_same_with_analyze_many(lemmatizer, words):
+    words = words + words[:5]
+    bulk = lemmatizer.analyze_bulk(words)
+    assert len(bulk) == len(words)
+    assert len(bulk.offsets) == len(words) + 1
+    for i, morphs in enumerate(lemmatizer.analyze_many(words)):
+        assert sorted(bulk[i]) == sorted(morphs)
+
+def test_analyze_bulk_ids():
+    lemmatizer = Lemmatizer()
+    bulk = lemmatizer.analyze_bulk(['차가우니까', '한국어', '파랬다'])
+    assert list(bulk.offsets) == [0, 1, 1, 2]
+    assert bulk.stems.decode(bulk.stem_ids) == ['차갑', '파랗']
+    assert bulk.tags.decode(bulk.tag_ids) == ['Adjective', 'Adjective']
+    # ids of the loaded dictionaries follow their sorted order
+    assert bulk.stems.get('차갑') < bulk.stems.get('파랗')
+
+def test_added_words_follow_loaded_ids():
+    lemmatizer = Lemmatizer(dictionary_name='demo')
+    n_stems = len(lemmatizer.analyze_bulk(['파랬다']).stems)
+    lemmatizer.add_words('어여쁘', 'Adjective')
+    bulk = lemmatizer.analyze_bulk(['어여뻤어'])
+    assert list(bulk.stem_ids) == [n_stems]
+
+def test_overlay_vocabulary_follows_base_ids():
+    base = Lemmatizer(dictionary_name='demo')
+    base_bulk = base.analyze_bulk(['파랬다'])
+    n_stems = len(base_bulk.stems)
+
+    tenant = base.overlay()
+    tenant.add_words('어여쁘', 'Adjective')
+    bulk = tenant.analyze_bulk(['어여뻤어'])
+    assert bulk.stems.decode(bulk.stem_ids) == ['어여쁘']
+    assert list(bulk.stem_ids) == [n_stems]
+
+    assert len(base_bulk.stems) == n_stems
+    assert base_bulk.stems.get('어여쁘') is None
+
+def test_layered_vocabulary():
+    base = Vocabulary(['가', '나'])
+    vocabulary = LayeredVocabulary(base)
+    assert vocabulary.intern('나') == 1
+    assert vocabulary.intern('다') == 2
+    assert vocabulary.decode([2, 0]) == ['다', '가']
+    assert len(base) == 2
@@ -0,0 +1,82 @@
+import sqlite3
+import time
+from soylemma import AnalysisCache
+from soylemma import Lemmatizer
+
+
+def test_add_words_invalidates_cache(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'cache.db'))
+    lemmatizer = Lemmatizer(dictionary_name='demo', cache=cache)
+    assert lemmatizer.analyze_many(['어여뻤어']) == [[]]
+    fingerprint = lemmatizer.fingerprint
+
+    lemmatizer.add_words('어여쁘', 'Adjective')
+    assert lemmatizer.fingerprint != fingerprint
+    assert lemmatizer.analyze_many(['어여뻤어']) == [[(('어여쁘', 'Adjective'), ('었어', 'Eomi'))]]
+
+    # the other lemmatizer of the old dictionary still reads its own entries
+    other = Lemmatizer(dictionary_name='demo', cache=cache)
+    assert other.analyze_many(['어여뻤어']) == [[]]
+
+def test_cached_results_are_same(tmp_path):
+    words = ['차가우니까', '파랬다', '한국어', '파랬다']
+    cache = AnalysisCache(str(tmp_path / 'cache.db'))
+    expected = Lemmatizer().analyze_many(words)
+    lemmatizer = Lemmatizer(cache=cache)
+    assert lemmatizer.analyze_many(words) == expected
+    assert len(cache) == 3
+    assert Lemmatizer(cache=cache).analyze_many(words) == expected
+
+def test_eviction_keeps_max_size(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = AnalysisCache(path, max_size=10)
+    for b in range(5):
+        cache.set_many('f', {'word{}-{}'.format(b, i): [] for i in range(4)})
+    assert len(cache) == 10
+    assert sqlite3.connect(path).execute('SELECT COUNT(*) FROM analysis').fetchone()[0] == 10
+    # the most recently written words are kept
+    assert set(cache.get_many('f', ['word4-0', 'word0-0'])) == {'word4-0'}
+    cache.purge()
+    assert len(cache) == 0
+
+def test_recently_read_words_are_kept(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'cache.db'), max_size=4)
+    cache.set_many('f', {'a': [], 'b': []})
+    cache.set_many('f', {'c': [], 'd': []})
+    assert set(cache.get_many('f', ['a'])) == {'a'}
+    # recency of the hit is written with the next insertion, before eviction
+    cache.set_many('f', {'e': []})
+    assert set(cache.get_many('f', ['a', 'b', 'c', 'd', 'e'])) == {'a', 'c', 'd', 'e'}
+
+def test_reads_do_not_wait_for_writer(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = AnalysisCache(path, timeout=0.1)
+    cache.set_many('f', {'파랬다': [(('파랗', 'Adjective'), ('았다', 'Eomi'))]})
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+    try:
+        assert cache.get_many('f', ['파랬다']) == {'파랬다': [(('파랗', 'Adjective'), ('았다', 'Eomi'))]}
+    finally:
+        writer.execute('ROLLBACK')
+        writer.close()
+
+def test_recency_flush_does_not_wait_for_writer(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = AnalysisCache(path, timeout=10)
+    cache.touch_batch_size = 1
+    cache.set_many('f', {'파랬다': []})
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+    try:
+        begin = time.perf_counter()
+        assert cache.get_many('f', ['파랬다']) == {'파랬다': []}
+        assert time.perf_counter() - begin < 1
+        # the recency is kept until the lock is free
+        assert len(cache._local.touched) == 1
+    finally:
+        writer.execute('ROLLBACK')
+        writer.close()
+    cache.get_many('f', ['파랬다'])
+    assert len(cache._local.touched) == 0
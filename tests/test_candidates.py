@@ -0,0 +1,54 @@
+from soylemma import Lemmatizer
+from soylemma.automaton import RuleAutomaton
+from soylemma.lemmatizer import iter_lemma_candidates
+
+
+def candidates(word, rules, **kwargs):
+    return set(iter_lemma_candidates(word, rules, **kwargs))
+
+def test_automaton_same_with_slicing(lemmatizer, word):
+    rules, automaton = lemmatizer.lemma_rules, lemmatizer.rule_automaton
+    expected = candidates(word, rules)
+    assert candidates(word, rules, automaton=automaton) == expected
+    assert candidates(word, rules, reverse=True, automaton=automaton) == expected
+
+def test_automaton_same_with_slicing_from_begin(lemmatizer, word):
+    rules, automaton = lemmatizer.lemma_rules, lemmatizer.rule_automaton
+    for begin in range(len(word)):
+        expected = candidates(word, rules, begin=begin)
+        assert candidates(word, rules, begin=begin, automaton=automaton) == expected
+        assert candidates(word, rules, begin=begin, reverse=True, automaton=automaton) == expected
+
+def test_surface_offsets():
+    # the eomi continues after the second syllable of a 2 or 3 syllables surface
+    rules = {'했': {('하', '았')}, '했다': {('하', '았다')}, '가우니': {('갑', '니')}}
+    lemmatizer = Lemmatizer(verbs={'하', '시작하'}, adjectives={'차갑'},
+        eomis={'았다', '니니까'}, lemma_rules=rules)
+    assert lemmatizer.analyze('시작했다') == [(('시작하', 'Verb'), ('았다', 'Eomi'))]
+    assert lemmatizer.analyze('차가우니까') == [(('차갑', 'Adjective'), ('니니까', 'Eomi'))]
+
+def test_longer_surface_is_replaced_as_whole():
+    rules = {'가나다라': {('갑', '니')}}
+    expected = ('갑', '니마', ('가나다라', '갑', '니'))
+    assert expected in candidates('가나다라마', rules, automaton=RuleAutomaton(rules))
+    assert expected in candidates('가나다라마', rules, reverse=True, automaton=RuleAutomaton(rules))
+    # without automaton, surfaces longer than 3 syllables are not looked up
+    assert not (expected in candidates('가나다라마', rules))
+
+def test_rule_automaton_matches():
+    automaton = RuleAutomaton({'했': set(), '했다': set(), '랬': set()})
+    assert len(automaton) == 3
+    assert automaton.max_length == 2
+    assert sorted(automaton.iter_matches('시작했다')) == [(2, '했'), (2, '했다')]
+    assert list(automaton.iter_matches('시작했다', 3)) == []
+
+def test_overlay_layers_automaton():
+    base = Lemmatizer()
+    n_surfaces = len(base.rule_automaton)
+    tenant = base.overlay()
+    tenant.add_lemma_rules({'꿨': {('꾸', '었')}, '했': {('하', '았')}})
+    assert tenant.rule_automaton.base is base.rule_automaton
+    assert len(base.rule_automaton) == n_surfaces
+    # only the private surfaces are compiled
+    assert len(tenant.rule_automaton.overlay) == sum(
+        1 for surface in ['꿨', '했'] if not (surface in base.lemma_rules))
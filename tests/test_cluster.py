@@ -0,0 +1,89 @@
+import socketserver
+import threading
+import pytest
+from soylemma.cluster import LemmatizerWorker
+from soylemma.cluster import LocalCluster
+from soylemma.cluster import ShardedLemmatizerClient
+
+
+class _BrokenHandler(socketserver.StreamRequestHandler):
+    # sends a truncated response to every request
+    def handle(self):
+        for line in self.rfile:
+            self.wfile.write(b'{"results": [[\n')
+            self.wfile.flush()
+
+class _ShortHandler(socketserver.StreamRequestHandler):
+    # sends fewer results than the requested words
+    def handle(self):
+        for line in self.rfile:
+            self.wfile.write(b'{"results": [[]]}\n')
+            self.wfile.flush()
+
+@pytest.fixture
+def cluster_words(words):
+    # enough distinct words to reach every worker on the hash ring
+    return words + ['단어{}'.format(i) for i in range(200)]
+
+@pytest.fixture
+def worker(lemmatizer):
+    worker = LemmatizerWorker(lemmatizer)
+    threading.Thread(target=worker.serve_forever, daemon=True).start()
+    yield worker
+    worker.shutdown()
+
+def _dead_address(lemmatizer):
+    dead = LemmatizerWorker(lemmatizer)
+    # the port is closed without serving
+    dead.server.server_close()
+    return dead.address
+
+def test_client_same_with_local(lemmatizer, worker, cluster_words):
+    client = ShardedLemmatizerClient([worker.address])
+    assert client.analyze_many(cluster_words) == lemmatizer.analyze_many(cluster_words)
+    assert client.lemmatize_many(cluster_words) == lemmatizer.lemmatize_many(cluster_words)
+    client.close()
+
+@pytest.mark.parametrize('handler', [_BrokenHandler, _ShortHandler])
+def test_failover_on_broken_response(lemmatizer, worker, cluster_words, handler):
+    broken = socketserver.ThreadingTCPServer(('127.0.0.1', 0), handler)
+    broken.daemon_threads = True
+    threading.Thread(target=broken.serve_forever, daemon=True).start()
+    address = broken.server_address[:2]
+    try:
+        client = ShardedLemmatizerClient([address, worker.address], timeout=5)
+        # words of the broken worker are sent to the other worker
+        assert client.analyze_many(cluster_words) == lemmatizer.analyze_many(cluster_words)
+        assert address in client._failed
+        assert not (address in client._connections)
+        client.close()
+    finally:
+        broken.shutdown()
+        broken.server_close()
+
+def test_failover_on_dead_worker(lemmatizer, worker, cluster_words):
+    address = _dead_address(lemmatizer)
+    client = ShardedLemmatizerClient([address, worker.address], timeout=5)
+    assert client.analyze_many(cluster_words) == lemmatizer.analyze_many(cluster_words)
+    assert address in client._failed
+    client.close()
+
+def test_all_workers_failed(lemmatizer, cluster_words):
+    client = ShardedLemmatizerClient([_dead_address(lemmatizer)], timeout=5)
+    with pytest.raises(ConnectionError):
+        client.analyze_many(cluster_words)
+
+def test_failed_worker_is_not_retried_in_same_call(lemmatizer, cluster_words):
+    # a failed worker is alive again immediately for later calls
+    client = ShardedLemmatizerClient([_dead_address(lemmatizer)], timeout=5, retry_interval=0)
+    with pytest.raises(ConnectionError):
+        client.analyze_many(cluster_words)
+
+def test_local_cluster(lemmatizer, cluster_words):
+    with LocalCluster(n_workers=2) as cluster:
+        client = cluster.client(timeout=5)
+        expected = lemmatizer.analyze_many(cluster_words)
+        assert client.analyze_many(cluster_words) == expected
+        cluster.kill(0)
+        assert client.analyze_many(cluster_words) == expected
+        client.close()
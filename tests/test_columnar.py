@@ -0,0 +1,42 @@
+import pytest
+from soylemma.columnar import lemmatize_column
+
+np = pytest.importorskip('numpy')
+
+
+WORDS = ['차가우니까', '한국어', '파랬다', '차가우니까', '하였다']
+
+def expected_lemmas(lemmatizer, word):
+    return sorted(lemmatizer.lemmatize(word))
+
+def test_numpy_column(lemmatizer):
+    columns = lemmatize_column(lemmatizer, np.array(WORDS, dtype=object))
+    assert list(columns['lemma']) == ['차갑다', None, '파랗다', '차갑다', '하다']
+    assert list(columns['tag']) == ['Adjective', None, 'Adjective', 'Adjective',
+        expected_lemmas(lemmatizer, '하였다')[0][1]]
+    assert list(columns['lemmas'][4]) == ['하다']
+    # rows with the same word share one list
+    assert columns['lemmas'][0] is columns['lemmas'][3]
+
+def test_pandas_column_with_missing_values(lemmatizer):
+    pd = pytest.importorskip('pandas')
+    series = pd.Series(WORDS + [None], index=range(10, 16))
+    frame = lemmatize_column(lemmatizer, series)
+    assert list(frame.index) == list(series.index)
+    # pandas may store missing lemmas as NaN of a string column
+    lemmas = [None if pd.isna(lemma) else lemma for lemma in frame['lemma']]
+    assert lemmas == ['차갑다', None, '파랗다', '차갑다', '하다', None]
+    assert frame['lemmas'].iloc[5] is None
+
+def test_arrow_column(lemmatizer):
+    pa = pytest.importorskip('pyarrow')
+    table = lemmatize_column(lemmatizer, pa.chunked_array([WORDS[:2], WORDS[2:] + [None]]))
+    assert table.column('lemma').to_pylist() == ['차갑다', None, '파랗다', '차갑다', '하다', None]
+    assert table.column('lemmas').to_pylist()[:2] == [['차갑다'], []]
+
+def test_processes_same_with_single_process(lemmatizer):
+    values = np.array(WORDS * 3, dtype=object)
+    single = lemmatize_column(lemmatizer, values)
+    parallel = lemmatize_column(lemmatizer, values, n_jobs=2, chunk_size=2)
+    for name in ['lemma', 'tag', 'lemmas']:
+        assert list(parallel[name]) == list(single[name])
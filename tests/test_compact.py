@@ -0,0 +1,67 @@
+import pickle
+import pytest
+from soylemma import CompactMorphemeSet
+from soylemma import Lemmatizer
+
+
+MORPHS = ['가', '가깝', '먹', '먹이', '하', '힣', '나']
+
+def test_membership():
+    morphs = CompactMorphemeSet(MORPHS)
+    assert len(morphs) == len(MORPHS)
+    assert list(morphs) == sorted(MORPHS)
+    for morph in MORPHS:
+        assert morph in morphs
+    for morph in ['', '각', '먹었', '힣힣', 'a']:
+        assert not (morph in morphs)
+    assert not (None in morphs)
+
+def test_prefix_query():
+    morphs = CompactMorphemeSet(MORPHS)
+    assert list(morphs.startswith('먹')) == ['먹', '먹이']
+    assert list(morphs.startswith('각')) == []
+    assert morphs.has_prefix('가')
+    assert not morphs.has_prefix('다')
+
+def test_update():
+    morphs = CompactMorphemeSet(MORPHS)
+    morphs.add('다')
+    morphs.update(['가', '라'])
+    assert list(morphs) == sorted(MORPHS + ['다', '라'])
+
+def test_serialization(tmp_path):
+    morphs = CompactMorphemeSet(MORPHS)
+    assert CompactMorphemeSet.from_bytes(morphs.to_bytes()) == morphs
+    path = str(tmp_path / 'morphs.bin')
+    morphs.save(path)
+    assert CompactMorphemeSet.load(path) == set(MORPHS)
+
+@pytest.fixture(scope='module')
+def compact_lemmatizer():
+    return Lemmatizer(dictionary_backend='compact')
+
+def test_compact_backend_same_with_set(lemmatizer, compact_lemmatizer, word):
+    assert isinstance(compact_lemmatizer.verbs, CompactMorphemeSet)
+    assert sorted(compact_lemmatizer.analyze(word)) == sorted(lemmatizer.analyze(word))
+
+def test_wrong_backend():
+    with pytest.raises(ValueError):
+        Lemmatizer(dictionary_backend='trie')
+
+def test_membership_after_pickle_and_load():
+    morphs = CompactMorphemeSet(MORPHS)
+    for other in [pickle.loads(pickle.dumps(morphs)), CompactMorphemeSet.from_bytes(morphs.to_bytes())]:
+        for morph in MORPHS:
+            assert morph in other
+        assert not ('각' in other)
+    empty = CompactMorphemeSet()
+    assert not ('가' in empty)
+
+def test_equality_with_other_types():
+    morphs = CompactMorphemeSet(MORPHS)
+    assert morphs == set(MORPHS)
+    assert set(MORPHS) == morphs
+    assert morphs != frozenset(['가'])
+    assert morphs != 3
+    assert morphs != None
+    assert morphs != sorted(MORPHS)
@@ -0,0 +1,82 @@
+import time
+import pytest
+from soylemma import Lemmatizer
+from soylemma.jamo import JamoRules
+from soylemma.jamo import fit_jamo_rules
+from soylemma.jamo import to_pattern
+from soylemma.lemmatizer import analyze_morphology
+from soylemma.utils import installpath
+
+
+def test_jamo_same_with_syllable(lemmatizer, jamo_lemmatizer, word):
+    if word == '했':
+        pytest.skip('jamo rules are exact on eojeols of the training corpus, and 했 is not one of them')
+    assert sorted(jamo_lemmatizer.analyze(word)) == sorted(lemmatizer.analyze(word))
+
+def test_jamo_generalizes_unseen_syllable(lemmatizer, jamo_lemmatizer):
+    assert not lemmatizer.analyze('했')
+    assert (('하', 'Verb'), ('았', 'Eomi')) in jamo_lemmatizer.analyze('했')
+
+def test_to_pattern():
+    assert to_pattern('추워', '춥', '어') == (('*', ' ', '워'), ('*', 'ㅂ', '어'))
+    # common suffix of tail and eomi is removed
+    assert to_pattern('했다', '하', '았다') == to_pattern('했', '하', '았')
+    assert to_pattern('했', '하하', '았') is None
+
+def test_fit_jamo_rules(lemmatizer, words, tmp_path):
+    jamo_rules = fit_jamo_rules(lemmatizer.lemma_rules, words,
+        lemmatizer.verbs, lemmatizer.adjectives, lemmatizer.eomis)
+    dictionaries = (lemmatizer.verbs, lemmatizer.adjectives, lemmatizer.eomis)
+    for word in words:
+        morphs = analyze_morphology(word, *dictionaries, jamo_rules)
+        assert sorted(morphs) == sorted(lemmatizer.analyze(word))
+
+    path = str(tmp_path / 'jamo_rules.txt')
+    jamo_rules.save(path)
+    loaded = JamoRules.load(path)
+    assert loaded.patterns == jamo_rules.patterns
+    assert loaded.rules == jamo_rules.rules
+
+def test_bounded_jamo_analysis():
+    lemmatizer = Lemmatizer(max_length=10, max_candidates=1000, time_budget=1.0,
+        rule_representation='jamo')
+    assert lemmatizer.analyze('파랬다', return_truncated=True) == (
+        [(('파랗', 'Adjective'), ('았다', 'Eomi'))], False)
+
+    lemmatizer = Lemmatizer(max_length=3, rule_representation='jamo')
+    morphs, truncated = lemmatizer.analyze('시작했다', return_truncated=True)
+    assert truncated
+    assert (('시작하', 'Verb'), ('았다', 'Eomi')) in morphs
+
+    lemmatizer = Lemmatizer(time_budget=0.001, rule_representation='jamo')
+    begin = time.perf_counter()
+    assert lemmatizer.analyze('가' * 100000, return_truncated=True)[1]
+    assert time.perf_counter() - begin < 0.1
+
+def test_jamo_overlay():
+    base = Lemmatizer(rule_representation='jamo')
+    expected = base.analyze('잗랬다')
+    tenant = base.overlay()
+    tenant.add_words('잗랗', 'Adjective')
+    tenant.add_lemma_rules({'꿨': {('꾸', '었')}})
+    assert (('잗랗', 'Adjective'), ('았다', 'Eomi')) in tenant.analyze('잗랬다')
+    assert (('꾸', 'Verb'), ('었다', 'Eomi')) in tenant.analyze('꿨다')
+    assert base.analyze('잗랬다') == expected
+
+    # pattern tables are shared with the base
+    assert tenant.jamo_rules.patterns is base.jamo_rules.patterns
+    assert tenant.jamo_rules._index is base.jamo_rules._index
+    assert tenant.jamo_rules.automaton.base is base.jamo_rules.automaton
+
+def test_jamo_keeps_only_conjugate_rules(lemmatizer, jamo_lemmatizer):
+    assert jamo_lemmatizer.lemma_rules is None
+    assert jamo_lemmatizer.rule_automaton is None
+    assert jamo_lemmatizer.conjugate('파랗', '았다') == lemmatizer.conjugate('파랗', '았다')
+    assert jamo_lemmatizer.memory_usage()['total'] < lemmatizer.memory_usage()['total']
+
+def test_find_conjugations_until_end():
+    jamo_rules = JamoRules.load(
+        '{}/soylemma/dictionary/default/jamo_rules.txt'.format(installpath))
+    conjugations = jamo_rules.find_conjugations('파랬다파랬다')
+    assert set(jamo_rules.find_conjugations('파랬다파랬다', end=3)) == {
+        i for i in conjugations if i < 3}
@@ -0,0 +1,42 @@
+import sys
+from soylemma import Lemmatizer
+from soylemma.memory import deep_sizeof
+from soylemma.memory import measure_loading
+
+
+COMPONENTS = ['verbs', 'adjectives', 'eomis', 'lemma_rules', 'conjugate_rules']
+
+def test_deep_sizeof_counts_shared_objects_once():
+    word = '가' * 100
+    assert deep_sizeof([word, word]) == sys.getsizeof([word, word]) + sys.getsizeof(word)
+    seen = set()
+    size = deep_sizeof({word}, seen)
+    assert deep_sizeof([word], seen) == sys.getsizeof([word])
+    assert size > sys.getsizeof(word)
+
+def test_memory_usage(lemmatizer):
+    report = lemmatizer.memory_usage()
+    for name in COMPONENTS:
+        assert report[name]['bytes'] > 0
+    assert report['verbs']['entries'] == len(lemmatizer.verbs)
+    assert report['lemma_rules']['entries'] == sum(len(v) for v in lemmatizer.lemma_rules.values())
+    assert report['total'] == sum(component['bytes'] for name, component in report.items()
+        if name != 'total')
+
+def test_compact_backend_uses_less_memory(lemmatizer):
+    compact = Lemmatizer(dictionary_backend='compact')
+    for name in ['verbs', 'adjectives', 'eomis']:
+        assert compact.memory_usage()[name]['bytes'] < lemmatizer.memory_usage()[name]['bytes']
+
+def test_cache_is_reported(tmp_path):
+    lemmatizer = Lemmatizer(cache=str(tmp_path / 'cache.db'))
+    lemmatizer.analyze_many(['파랬다', '차가우니까'])
+    report = lemmatizer.memory_usage()
+    assert report['cache']['entries'] == 2
+    assert report['cache']['disk_bytes'] > 0
+
+def test_measure_loading():
+    lemmatizer, report = measure_loading(dictionary_name='demo')
+    assert isinstance(lemmatizer, Lemmatizer)
+    assert report['seconds'] > 0
+    assert report['peak_traced_bytes'] > 0
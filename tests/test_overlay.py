@@ -0,0 +1,51 @@
+from soylemma import Lemmatizer
+from soylemma.layered import LayeredMorphemeSet
+from soylemma.layered import LayeredRules
+
+
+def test_overlay_isolation():
+    base = Lemmatizer()
+    expected = base.analyze('잗랬다')
+    fingerprint = base.fingerprint
+
+    tenant = base.overlay()
+    tenant.add_words('잗랗', 'Adjective')
+    tenant.add_lemma_rules({'랬': {('랗', '았')}})
+    tenant.add_lemma_rules({'꿨': {('꾸', '었')}})
+
+    assert (('잗랗', 'Adjective'), ('았다', 'Eomi')) in tenant.analyze('잗랬다')
+    assert base.analyze('잗랬다') == expected
+    assert not ('잗랗' in base.adjectives)
+    assert not ('꿨' in base.lemma_rules)
+    assert base.fingerprint == fingerprint
+    assert tenant.fingerprint != fingerprint
+
+    other = base.overlay()
+    assert other.analyze('잗랬다') == expected
+
+def test_overlay_shares_base_dictionaries():
+    base = Lemmatizer(dictionary_name='demo')
+    tenant = base.overlay()
+    tenant.add_words('어여쁘', 'Adjective')
+    assert tenant.adjectives.base is base.adjectives
+    assert tenant.adjectives.overlay == {'어여쁘'}
+    assert tenant.lemma_rules.base is base.lemma_rules
+    assert tenant.analyze('어여뻤어') == [(('어여쁘', 'Adjective'), ('었어', 'Eomi'))]
+    assert base.analyze('어여뻤어') == []
+
+def test_layered_morpheme_set():
+    morphs = LayeredMorphemeSet({'가', '나'})
+    morphs.update(['나', '다'])
+    assert morphs.overlay == {'다'}
+    assert len(morphs) == 3
+    assert sorted(morphs) == ['가', '나', '다']
+
+def test_layered_rules():
+    base = {'했': {('하', '았')}}
+    rules = LayeredRules(base)
+    rules['했'] = rules['했'] | {('해', '었')}
+    rules['꿨'] = {('꾸', '었')}
+    assert base == {'했': {('하', '았')}}
+    assert len(rules) == 2
+    assert rules.get('했') == {('하', '았'), ('해', '었')}
+    assert dict(rules.items()) == {'했': {('하', '았'), ('해', '었')}, '꿨': {('꾸', '었')}}
@@ -0,0 +1,62 @@
+from soylemma.jamo import JamoRules
+from soylemma.pruning import evaluate
+from soylemma.pruning import fit_pruned_jamo_rules
+from soylemma.pruning import load_dictionary_counts
+from soylemma.pruning import profile
+from soylemma.pruning import prune
+from soylemma.pruning import pruned_lemmatizer
+from soylemma.pruning import save_dictionary
+
+
+WORD_COUNTS = {'파랬다': 10, '차가우니까': 5, '시작했다': 3, '한국어': 2}
+
+def test_profile_counts_words_once(lemmatizer):
+    prof = profile(lemmatizer, WORD_COUNTS)
+    assert prof.n_words == 20
+    assert prof.n_analyzed == 18
+    assert prof.adjectives == {'파랗': 10, '차갑': 5}
+    assert prof.rules[('랬다', '랗', '았다')] == 10
+
+def test_prune_without_loss(lemmatizer):
+    prof = profile(lemmatizer, WORD_COUNTS)
+    verbs, adjectives, eomis, rules = prune(lemmatizer, prof, max_loss=0)
+    # entries unused on the profiled corpus are removed
+    assert set(adjectives) == {'파랗', '차갑'}
+    pruned = pruned_lemmatizer(verbs, adjectives, eomis, rules)
+    for word in WORD_COUNTS:
+        assert sorted(pruned.analyze(word)) == sorted(lemmatizer.analyze(word))
+
+def test_prune_in_budget(lemmatizer):
+    prof = profile(lemmatizer, WORD_COUNTS)
+    pruned = pruned_lemmatizer(*prune(lemmatizer, prof, max_loss=0.2))
+    report = evaluate(lemmatizer, pruned, WORD_COUNTS)
+    assert 0 < report['accuracy_loss'] <= 0.2
+    assert report['pruned']['n_eomis'] < report['base']['n_eomis']
+    assert report['base']['memory_bytes'] == lemmatizer.memory_usage()['total']
+
+def test_loss_on_heldout_words(lemmatizer):
+    prof = profile(lemmatizer, WORD_COUNTS)
+    pruned = pruned_lemmatizer(*prune(lemmatizer, prof, max_loss=0))
+    # entries unused on the profiled corpus are removed, whatever the budget
+    report = evaluate(lemmatizer, pruned, {'먹었다': 1, '파랬다': 1})
+    assert report['accuracy_loss'] == 0.5
+
+def test_prune_keeps_training_counts(lemmatizer):
+    prof = profile(lemmatizer, WORD_COUNTS)
+    counts = load_dictionary_counts()
+    verbs, adjectives, eomis, rules = prune(lemmatizer, prof, max_loss=0, counts=counts)
+    assert adjectives['파랗'] == counts[1]['파랗']
+    assert verbs['시작하'] == counts[0]['시작하']
+
+def test_save_dictionary(lemmatizer, tmp_path):
+    prof = profile(lemmatizer, WORD_COUNTS)
+    pruned = prune(lemmatizer, prof, max_loss=0)
+    jamo_rules = fit_pruned_jamo_rules(*pruned, WORD_COUNTS)
+    save_dictionary(str(tmp_path), *pruned, jamo_rules)
+    with open(str(tmp_path / 'rules.txt'), encoding='utf-8') as f:
+        assert '랬다 랗 았다\n' in f.readlines()
+    assert len(JamoRules.load(str(tmp_path / 'jamo_rules.txt'))) == len(jamo_rules)
+
+    # jamo rules fitted to other rules are removed
+    save_dictionary(str(tmp_path), *pruned)
+    assert not (tmp_path / 'jamo_rules.txt').exists()
@@ -0,0 +1,75 @@
+import random
+import pytest
+from soylemma.sketch import Reservoir
+from soylemma.sketch import SpaceSaving
+from soylemma.trainer import iter_count_table
+from soylemma.trainer import train_model_bounded_memory
+
+
+TABLE = """Eojeol\tMorphemes\tCount
+파랬다\t파랗/Adjective + 았다/Eomi\t3
+했다\t하/Verb + 았다/Eomi\t2
+먹었다\t먹/Verb + 었다/Eomi\t5
+했다\t하/Verb + 았다/Eomi\t4
+"""
+
+def test_space_saving_bounds():
+    rng = random.Random(0)
+    stream = [min(int(rng.paretovariate(1.2)), 500) for _ in range(20000)]
+    counter = SpaceSaving(capacity=50)
+    for item in stream:
+        counter.add(item)
+    true_counts = {}
+    for item in stream:
+        true_counts[item] = true_counts.get(item, 0) + 1
+
+    estimated = counter.items()
+    guaranteed = counter.items(guaranteed=True)
+    assert len(counter) == 50
+    for item, count in true_counts.items():
+        if count > counter.error_bound:
+            assert item in estimated
+        if item in estimated:
+            assert guaranteed[item] <= count <= estimated[item]
+            assert estimated[item] - count <= counter.error_bound
+
+def test_space_saving_wrong_capacity():
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
+
+def test_reservoir_size():
+    reservoir = Reservoir(10, seed=0)
+    for i in range(100):
+        reservoir.add(i)
+    assert len(reservoir) == 10
+    assert reservoir.n_seen == 100
+
+def test_train_from_count_table(tmp_path):
+    path = tmp_path / 'table.txt'
+    path.write_text(TABLE, encoding='utf-8')
+    adjectives, verbs, eomis, rules, exceptions, lemmatizing_count = \
+        train_model_bounded_memory(iter_count_table(str(path)))
+    assert lemmatizing_count == 14
+    # rows without conjugation give no rule, and they are not counted
+    assert adjectives == {'파랗': 3}
+    assert verbs == {'하': 6}
+    assert eomis == {'았다': 9}
+    assert rules == {'랬다': {('랗', '았다')}, '했다': {('하', '았다')}}
+    assert exceptions == {}
+
+def test_space_saving_counts_replacements():
+    counter = SpaceSaving(capacity=2)
+    for item in ['가', '가', '나', '다', '가']:
+        counter.add(item)
+    assert counter.n_replaced == 1
+
+def test_train_filters_rare_rules(tmp_path, capsys):
+    path = tmp_path / 'table.txt'
+    path.write_text(TABLE, encoding='utf-8')
+    rules = train_model_bounded_memory(iter_count_table(str(path)), min_rule_count=4)[3]
+    assert rules == {'했다': {('하', '았다')}}
+
+    # the rule of a single slot is replaced by the later rule
+    rules = train_model_bounded_memory(iter_count_table(str(path)), rule_capacity=1)[3]
+    assert rules == {'했다': {('하', '았다')}}
+    assert '1 monitored rules were replaced' in capsys.readouterr().out
@@ -1,6 +1,9 @@
 import argparse
 import os
 import soylemma
+from soylemma import fit_jamo_rules
+from soylemma import iter_count_table
+from soylemma import train_model_bounded_memory
 from soylemma import train_model_using_sejong_corpus_cleaner
 
 def prune_dictionary(dic, min_count):
@@ -17,6 +20,20 @@ def save_rules(rules, path):
             for l, r in sorted(canons):
                 f.write('{} {} {}\n'.format(surface, l, r))
 
+def iter_eojeols(table_path):
+    # streams the table. Only adjacent repeats are skipped, analyzing an eojeol again is harmless
+    previous = None
+    for (eojeol, _), _ in iter_count_table(table_path):
+        if eojeol != previous:
+            yield eojeol
+        previous = eojeol
+
+def save_jamo_rules(rules, table_path, adjectives, verbs, eomis, path):
+    eojeols = iter_eojeols(table_path)
+    jamo_rules = fit_jamo_rules(rules, eojeols, set(verbs), set(adjectives), set(eomis))
+    jamo_rules.save(path)
+    print('Generalized {} rules to {}'.format(sum(len(canons) for canons in rules.values()), jamo_rules))
+
 def save_exceptions(exceptions):
     with open('exception_cases_logs', 'w', encoding='utf-8') as f:
         for exception, count in sorted(exceptions.items(), key=lambda x:-x[1]):
@@ -31,6 +48,20 @@ def main():
         help='L-R corpus type')
     parser.add_argument('--min_count', type=int, default=1, help='Minimum frequency of morphemes in dictionary')
     parser.add_argument('--dictionary_name', type=str, default='default', help='Dictioanry name')
+    parser.add_argument('--bounded_memory', dest='bounded_memory', action='store_true',
+        help='Train with approximate counters of fixed memory. Use it for corpora larger than Sejong')
+    parser.add_argument('--capacity', type=int, default=100000,
+        help='Maximum number of morphemes of each tag monitored in bounded memory training')
+    parser.add_argument('--rule_capacity', type=int, default=50000,
+        help='Maximum number of rules monitored in bounded memory training')
+    parser.add_argument('--exception_capacity', type=int, default=10000,
+        help='Number of exceptions sampled in bounded memory training')
+    parser.add_argument('--min_rule_count', type=int, default=1,
+        help='Minimum guaranteed frequency of rules in bounded memory training')
+    parser.add_argument('--table_path', type=str, default='',
+        help='Count table path. If empty, the table of sejong_corpus_cleaner is used')
+    parser.add_argument('--jamo_rules', dest='jamo_rules', action='store_true',
+        help='Also save rules generalized at jamo level, which are exact on eojeols of the count table')
 
     args = parser.parse_args()
     local_repository_path = args.sejong_corpus_cleaner_repository
@@ -41,14 +72,26 @@ def main():
     if not os.path.exists(dictionary_path):
         os.makedirs(dictionary_path)
 
-    table_path = '{}/data/clean/counter_{}_pair_all.txt'.format(local_repository_path, corpus_type)
-    parameters = train_model_using_sejong_corpus_cleaner(local_repository_path, table_path)
+    table_path = args.table_path
+    if not table_path:
+        table_path = '{}/data/clean/counter_{}_pair_all.txt'.format(local_repository_path, corpus_type)
+    if args.bounded_memory:
+        parameters = train_model_bounded_memory(iter_count_table(table_path), capacity=args.capacity,
+            rule_capacity=args.rule_capacity, exception_capacity=args.exception_capacity,
+            min_rule_count=args.min_rule_count)
+    else:
+        parameters = train_model_using_sejong_corpus_cleaner(local_repository_path, table_path)
     adjectives, verbs, eomis, rules, exceptions, lemmatizing_count = parameters
 
-    save_dictionary(prune_dictionary(adjectives, min_count),  '.{}Adjectives.txt'.format(dictionary_path))
-    save_dictionary(prune_dictionary(verbs, min_count),  '{}Verbs.txt'.format(dictionary_path))
-    save_dictionary(prune_dictionary(eomis, min_count),  '{}Eomis.txt'.format(dictionary_path))
+    adjectives = prune_dictionary(adjectives, min_count)
+    verbs = prune_dictionary(verbs, min_count)
+    eomis = prune_dictionary(eomis, min_count)
+    save_dictionary(adjectives,  '.{}Adjectives.txt'.format(dictionary_path))
+    save_dictionary(verbs,  '{}Verbs.txt'.format(dictionary_path))
+    save_dictionary(eomis,  '{}Eomis.txt'.format(dictionary_path))
     save_rules(rules, '{}rules.txt'.format(dictionary_path))
+    if args.jamo_rules:
+        save_jamo_rules(rules, table_path, adjectives, verbs, eomis, '{}jamo_rules.txt'.format(dictionary_path))
     if exceptions:
         save_exceptions(exceptions)
 